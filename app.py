@@ -2,14 +2,34 @@
 OpenAlex Publications Retriever
 Main application entry point
 """
+import gc
 import streamlit as st
 from ui.landing import show_landing_page
 from ui.institutions import render_institution_selector
 from ui.authors import render_author_selector
-from ui.common import render_config_section, render_retrieval_section
+from ui.common import render_config_section, render_retrieval_section, get_http_session
+from core.api_client import MAILTO, HTTP_CACHE_ENABLED, clear_http_cache
 
-# Constants
-MAILTO = "theodore.hervieux@sirisacademic.com"
+def reset_selection():
+    """Back to method selection (button callback: runs before the rerun, so no extra st.rerun())."""
+    st.session_state.selection_mode = None
+    st.session_state.selected_entities = []
+    if 'author_candidates' in st.session_state:
+        del st.session_state.author_candidates
+    if 'config' in st.session_state:
+        del st.session_state.config
+    if 'retrieval_output' in st.session_state:
+        del st.session_state.retrieval_output
+
+@st.cache_resource
+def freeze_startup_objects() -> bool:
+    """
+    Once per process: move everything alive after imports (modules, classes, constants) to the
+    permanent generation, so full collections during large retrievals don't re-walk them.
+    """
+    gc.collect()
+    gc.freeze()
+    return True
 
 def main():
     st.set_page_config(
@@ -18,12 +38,21 @@ def main():
         layout="wide"
     )
     
+    freeze_startup_objects()
+    
     # Initialize session state
     if 'selection_mode' not in st.session_state:
         st.session_state.selection_mode = None
     if 'selected_entities' not in st.session_state:
         st.session_state.selected_entities = []
     
+    # On-disk HTTP cache controls (only when OPENALEX_CACHE=1)
+    if HTTP_CACHE_ENABLED:
+        with st.sidebar:
+            if st.button("🧹 Clear HTTP cache", help="Forget cached OpenAlex responses"):
+                clear_http_cache(get_http_session())
+                st.success("HTTP cache cleared")
+    
     st.title("📚 OpenAlex Publications Retriever")
     st.markdown(f"*SIRIS Academic Research Tool - Contact: {MAILTO}*")
     
@@ -34,14 +63,7 @@ def main():
         # Show switch method button
         col1, col2, col3 = st.columns([1, 2, 1])
         with col3:
-            if st.button("↩️ Switch Method", help="Go back to method selection"):
-                st.session_state.selection_mode = None
-                st.session_state.selected_entities = []
-                if 'author_candidates' in st.session_state:
-                    del st.session_state.author_candidates
-                if 'config' in st.session_state:
-                    del st.session_state.config
-                st.rerun()
+            st.button("↩️ Switch Method", help="Go back to method selection", on_click=reset_selection)
         
         # Display current mode
         mode_icon = "🏛️" if st.session_state.selection_mode == "institutions" else "👤"
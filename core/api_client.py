@@ -1,11 +1,27 @@
 # core/api_client.py
-"""OpenAlex API client functions (polite, thread-safe rate limiting; no ORCID lookups)."""
+"""OpenAlex API client functions (polite, thread-safe rate limiting; no ORCID lookups).
+
+Works requests send select=, so only the top-level fields our formatters read are downloaded:
+the retrieval passes the keys its selected metadata needs (processors._top_level_fields_needed),
+anything else falls back to WORKS_SELECT. When a new metadata field or formatter needs another
+top-level key, add it to WORKS_SELECT (and to processors._SELECT_SOURCES if it is read under another name).
+"""
 
 from typing import Dict, List, Optional, Any, Tuple
+import atexit
+import os
+import random
 import threading
-import requests
 import time
-import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import orjson
+import requests
+from urllib3.util import Retry, make_headers
+
+from .formatters import canonicalize_ids
 
 # -------------------- Constants --------------------
 
@@ -15,35 +31,130 @@ MAILTO = "theodore.hervieux@sirisacademic.com"
 PUBLICATIONS_DELAY = 0.10   # works endpoints
 AUTHORS_DELAY = 0.20        # authors search
 RETRY_AFTER_429 = 2.0
+MAX_RETRY_AFTER = 60.0      # cap on a server-sent Retry-After (daily-limit 429s can ask for hours)
 
 # Parallelism (used elsewhere; keep as-is)
-MAX_WORKERS = 3             # for works fetching by doc type
+MAX_WORKERS = 3             # for works fetching by doc type / year slice (per entity)
+PARALLEL_ENTITIES = 5       # entities (institutions/authors) retrieved concurrently
 MAX_AUTHOR_WORKERS = 10     # suggested upper bound for author prefetch (optional)
 
+# Keep-alive pool: one warm connection per concurrent worker, so no request pays a fresh TCP+TLS handshake
+POOL_SIZE = max(MAX_WORKERS * PARALLEL_ENTITIES, MAX_AUTHOR_WORKERS)
+
+# Optional on-disk HTTP cache (opt-in with OPENALEX_CACHE=1; needs the 'requests-cache' package)
+HTTP_CACHE_ENABLED = os.environ.get("OPENALEX_CACHE") == "1"
+HTTP_CACHE_NAME = "openalex_cache"  # SQLite file in the working directory
+HTTP_CACHE_EXPIRE = 86400           # seconds
+
+# Transient server errors, retried like 429 by rate_limited_get through the global limiter
+# (the adapter's Retry only covers connection errors: its status retries would bypass the pacing)
+RETRY_STATUSES = (500, 502, 503, 504)
+
 # -------------------- Global rate limit state --------------------
 
-_last_request_time: float = 0.0
-_rate_lock = threading.Lock()
+class RateLimiter:
+    """
+    Thread-safe pacing shared by all workers.
+    Each caller reserves the next free slot inside a tiny critical section (arithmetic only)
+    and sleeps outside the lock, so threads never queue behind a sleeping holder.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._next_slot = 0.0  # time.monotonic() of the earliest free slot
+
+    def wait(self, delay: float) -> None:
+        """Block until the caller may issue a request, keeping >= delay between requests."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + delay
+        wait_s = slot - now
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+    def defer(self, seconds: float) -> None:
+        """Push the next free slot back (e.g. after a 429), so every thread backs off, not just the caller."""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+_limiter = RateLimiter()
+
+# -------------------- Shared page-fetch pool --------------------
+
+# Process-wide workers for single page fetches (the one-page lookahead), created once instead of a
+# pool per entity. Sized like the connection pool: every entity running in parallel can keep
+# MAX_WORKERS pages in flight. Only leaf work goes here: a task that waits (on other EXECUTOR tasks,
+# or on a queue like the cursor-stream workers) could starve the pool, so those keep their own pools.
+EXECUTOR = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="openalex-pages")
+atexit.register(EXECUTOR.shutdown, wait=False, cancel_futures=True)
 
 # -------------------- Session --------------------
 
 def get_session() -> requests.Session:
-    """Create a requests session with connection pooling and a proper UA."""
-    s = requests.Session()
+    """
+    Create a requests session with a keep-alive pool sized to our worker count and a proper UA.
+    With OPENALEX_CACHE=1, successful GETs are served from a local SQLite cache (honoring Cache-Control);
+    429/5xx responses are never stored. Connection errors and 5xx are retried with backoff by the adapter.
+    """
+    if HTTP_CACHE_ENABLED:
+        import requests_cache
+        s = requests_cache.CachedSession(
+            cache_name=HTTP_CACHE_NAME,
+            backend="sqlite",
+            expire_after=HTTP_CACHE_EXPIRE,
+            allowable_methods=("GET",),
+            allowable_codes=(200,),
+            cache_control=True,
+        )
+    else:
+        s = requests.Session()
     s.headers.update({
-        "User-Agent": f"SIRIS Academic Research Tool/1.0 (mailto:{MAILTO})"
+        "User-Agent": f"SIRIS Academic Research Tool/1.0 (mailto:{MAILTO})",
+        # every codec urllib3 can decode here (adds br/zstd when brotli/zstandard are installed)
+        "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
     })
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status=0,  # no status retries here: 429/5xx go back to rate_limited_get and its limiter
+        allowed_methods=("GET",),
+        raise_on_status=False,
+    )
     adapter = requests.adapters.HTTPAdapter(
-        pool_connections=10,
-        pool_maxsize=10,
-        max_retries=3,
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=retry,
     )
     s.mount("http://", adapter)
     s.mount("https://", adapter)
     return s
 
+def clear_http_cache(session: requests.Session) -> bool:
+    """Drop every cached response. Returns False when the session has no cache."""
+    cache = getattr(session, "cache", None)
+    if cache is None:
+        return False
+    cache.clear()
+    return True
+
 # -------------------- Core HTTP with polite throttling --------------------
 
+def _retry_after_seconds(resp: requests.Response) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP date) as seconds, capped at MAX_RETRY_AFTER; None if absent/invalid."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
 def rate_limited_get(
     session: requests.Session,
     url: str,
@@ -52,20 +163,13 @@ def rate_limited_get(
     max_retries: int = 3,
     delay: float = PUBLICATIONS_DELAY,
 ) -> Optional[requests.Response]:
-    """Rate-limited GET with exponential backoff. Global lock enforces min delay across threads."""
-    global _last_request_time
-
+    """Rate-limited GET with exponential backoff. Global limiter enforces min delay across threads."""
     retries = 0
     backoff = RETRY_AFTER_429
 
     while retries <= max_retries:
         # throttle globally
-        with _rate_lock:
-            now = time.time()
-            elapsed = now - _last_request_time
-            if elapsed < delay:
-                time.sleep(delay - elapsed)
-            _last_request_time = time.time()
+        _limiter.wait(delay)
 
         try:
             resp = session.get(url, params=params, timeout=30)
@@ -80,14 +184,17 @@ def rate_limited_get(
         if resp.status_code == 200:
             return resp
 
-        # Too many requests -> backoff and retry
-        if resp.status_code == 429:
+        # Too many requests / transient server error -> backoff and retry
+        if resp.status_code == 429 or resp.status_code in RETRY_STATUSES:
             retries += 1
             if retries > max_retries:
                 return resp
-            # jittered backoff
-            wait = backoff * (0.5 + 0.5 * random.random())
-            time.sleep(wait)
+            # server's Retry-After if given, else jittered backoff; applied to the shared limiter,
+            # so all workers pause (the next _limiter.wait() sleeps it off)
+            wait = _retry_after_seconds(resp)
+            if wait is None:
+                wait = backoff * (0.5 + 0.5 * random.random())
+            _limiter.defer(wait)
             backoff *= 2
             continue
 
@@ -98,37 +205,79 @@ def rate_limited_get(
 
 # -------------------- Authors search (name only) --------------------
 
-def search_author_by_name(session: requests.Session, first_name: str, last_name: str) -> List[Dict[str, Any]]:
-    """Search authors by name. Returns raw /authors 'results' list (not /people)."""
+def search_author_by_name(
+    session: requests.Session,
+    first_name: str,
+    last_name: str,
+    per_page: int = 20,
+    select: str = "id,display_name,orcid,works_count,affiliations,last_known_institutions,topics",
+    *,
+    strict: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Search authors by name. Returns raw /authors 'results' list (not /people):
+    the per_page most relevant matches, trimmed to the fields candidate rows read
+    (select is top-level only on OpenAlex, so nested objects come whole).
+    A failed request returns [] unless strict, which raises instead so callers
+    can tell "no match" from "not asked" (e.g. to keep failures out of a cache).
+    """
     url = "https://api.openalex.org/authors"
     params = {
         "search": f"{first_name} {last_name}",
-        "per_page": 50,          # pull a bigger page; caller can cap to 20
+        "per_page": per_page,
+        "select": select,
         "mailto": MAILTO,
     }
     resp = rate_limited_get(session, url, params=params, delay=AUTHORS_DELAY)
     if resp and resp.status_code == 200:
         try:
-            data = resp.json()
+            data = orjson.loads(resp.content)
             return data.get("results", []) or []
         except Exception:
+            if strict:
+                raise
             return []
+    if strict:
+        if resp is None:
+            raise requests.exceptions.ConnectionError(f"author search failed: {url}")
+        resp.raise_for_status()  # 429 after the last retry, 4xx/5xx
     return []
 
 # -------------------- Works paging helper --------------------
 
-def fetch_works_page(session: requests.Session, url: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int, bool]:
+# Top-level /works fields consumed by ui.common.METADATA_FIELDS and core.processors
+# ('institutions' and 'raw_affiliation_strings' are read from 'authorships')
+WORKS_SELECT = ",".join([
+    "id", "doi", "display_name", "publication_year", "publication_date", "language", "type",
+    "abstract_inverted_index", "has_fulltext", "is_retracted", "is_authors_truncated",
+    "open_access", "apc_paid", "primary_location",
+    "authorships", "countries_distinct_count", "institutions_distinct_count",
+    "corresponding_author_ids", "corresponding_institution_ids",
+    "fwci", "cited_by_count", "citation_normalized_percentile", "counts_by_year",
+    "primary_topic", "topics", "concepts",
+    "sustainable_development_goals", "grants", "datasets",
+])
+
+def fetch_works_cursor_page(
+    session: requests.Session, url: str, params: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], int, Optional[str], bool]:
     """
-    Fetch one page from /works. Returns (results, total_count, success_flag).
-    Caller is responsible for setting 'per_page' and 'page' in params.
+    Fetch one cursor page from /works. Returns (results, total_count, next_cursor, success_flag).
+    Caller is responsible for setting 'per_page' and 'cursor' ("*" for the first page) in params.
+    Cursor paging has no 10k-result ceiling, unlike 'page' offsets.
+    'select' defaults to WORKS_SELECT to trim the payload.
     """
+    params.setdefault("select", WORKS_SELECT)
     resp = rate_limited_get(session, url, params=params, delay=PUBLICATIONS_DELAY)
     if not resp or resp.status_code != 200:
-        return [], 0, False
+        return [], 0, None, False
     try:
-        data = resp.json()
+        data = orjson.loads(resp.content)
+        meta = data.get("meta", {}) or {}
         results = data.get("results", []) or []
-        total = int(data.get("meta", {}).get("count", 0) or 0)
-        return results, total, True
+        for work in results:
+            canonicalize_ids(work)  # bare ids from here on
+        total = int(meta.get("count", 0) or 0)
+        return results, total, meta.get("next_cursor"), True
     except Exception:
-        return [], 0, False
+        return [], 0, None, False
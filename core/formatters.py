@@ -1,150 +1,263 @@
 """Data formatting functions"""
 import unicodedata
-from typing import Dict, List, Optional, Any
-import re
+from collections import defaultdict
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
 
-# Pre-compiled regex patterns
-OPENALEX_PATTERN = re.compile(r'https://openalex.org/')
-DOI_PATTERN = re.compile(r'https://doi.org/')
+__all__ = [
+    "OPENALEX_PREFIX",
+    "DOI_PREFIX",
+    "ORCID_PREFIX",
+    "CONCEPT_LEVELS",
+    "POS_FIRST",
+    "POS_MIDDLE",
+    "POS_LAST",
+    "POS_NOT_FOUND",
+    "canonicalize_ids",
+    "bare_id",
+    "clean_text_field",
+    "clean_text_column",
+    "format_abstract_optimized",
+    "format_authorships_bundle",
+    "format_counts_by_year",
+    "format_topic_and_score",
+    "format_concepts",
+    "format_sdgs",
+    "format_grants",
+    "build_author_index",
+    "position_from_index",
+    "extract_author_position",
+]
+
+# URL prefixes stripped from ids (constant literals: str.removeprefix, no regex engine)
+OPENALEX_PREFIX = "https://openalex.org/"
+DOI_PREFIX = "https://doi.org/"
+ORCID_PREFIX = "https://orcid.org/"
+
+# Author position labels: every stamped row references one of these four objects
+POS_FIRST = "First"
+POS_MIDDLE = "Middle"
+POS_LAST = "Last"
+POS_NOT_FOUND = "Not found"
+
+def canonicalize_ids(work: Dict) -> None:
+    """
+    Strip URL prefixes from every id of a raw /works record, in place, once at ingest
+    (id, doi, author/institution ids in authorships, corresponding_*_ids, concept ids).
+    Downstream formatters then read bare ids directly.
+    """
+    work_id = work.get("id")
+    if work_id:
+        work["id"] = work_id.removeprefix(OPENALEX_PREFIX)
+    doi = work.get("doi")
+    if doi:
+        work["doi"] = doi.removeprefix(DOI_PREFIX)
+    
+    for authorship in work.get("authorships") or []:
+        author = authorship.get("author")
+        if author and author.get("id"):
+            author["id"] = author["id"].removeprefix(OPENALEX_PREFIX)
+        for inst in authorship.get("institutions") or []:
+            if inst.get("id"):
+                inst["id"] = inst["id"].removeprefix(OPENALEX_PREFIX)
+    
+    for key in ("corresponding_author_ids", "corresponding_institution_ids"):
+        ids = work.get(key)
+        if ids:
+            work[key] = [i.removeprefix(OPENALEX_PREFIX) for i in ids]
+    
+    for concept in work.get("concepts") or []:
+        if concept.get("id"):
+            concept["id"] = concept["id"].removeprefix(OPENALEX_PREFIX)
+
+# Control characters (C0, DEL, C1) and Unicode line/paragraph separators -> space
+_CTRL_TABLE = str.maketrans({
+    **{c: " " for c in range(0x00, 0x20)},
+    **{c: " " for c in range(0x7f, 0xa0)},
+    0x2028: " ",
+    0x2029: " ",
+})
 
 def clean_text_field(text: str) -> str:
     """Clean text fields by removing ALL line breaks and control characters"""
     if not text or not isinstance(text, str):
         return text
     
-    # Remove all control characters
-    text = re.sub(r'[\x00-\x1f\x7f-\x9f]', ' ', text)
-    text = text.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
-    text = text.replace('\u2028', ' ').replace('\u2029', ' ')
-    text = ' '.join(text.split())
-    return text.strip()
+    # Single C-level pass over the string, then collapse whitespace
+    return " ".join(text.translate(_CTRL_TABLE).split())
+
+# Anything clean_text_field would rewrite: control chars, non-space whitespace,
+# doubled spaces, leading/trailing spaces. Literal characters (not \u escapes)
+# so the same pattern works with both Python re and the Arrow (RE2) engine.
+_DIRTY_TEXT_PATTERN = "[\x00-\x1f\x7f-\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]|  |^ | $"
+
+def clean_text_column(column: pd.Series) -> pd.Series:
+    """
+    Column-wise clean_text_field: one vectorized regex scan flags the dirty cells,
+    only those go through the Python cleaner. Non-string cells are left untouched.
+    """
+    if not (column.dtype == object or pd.api.types.is_string_dtype(column)):
+        return column
+    
+    try:
+        # na=False: None, numbers and other non-string cells of a mixed column are never dirty
+        dirty = column.str.contains(_DIRTY_TEXT_PATTERN, regex=True, na=False).to_numpy(dtype=bool)
+    except AttributeError:
+        return column  # object column without a single string (e.g. all integers): nothing to clean
+    if not dirty.any():
+        return column
+    
+    column = column.copy()
+    column[dirty] = column[dirty].map(clean_text_field)
+    return column
 
 def format_abstract_optimized(inverted_index: Dict) -> str:
-    """Optimized abstract reconstruction"""
+    """
+    Optimized abstract reconstruction. Positions normally cover 0..n-1 exactly, so each word is
+    scattered straight into its slot (no sort); gapped or repeated positions fall back to one flat
+    position buffer sorted in NumPy.
+    """
     if not inverted_index:
         return ""
     
     try:
-        positions = []
-        words = []
-        
-        for word, pos_list in inverted_index.items():
-            positions.extend(pos_list)
-            words.extend([word] * len(pos_list))
-        
-        if not positions:
+        total = sum(map(len, inverted_index.values()))
+        if not total:
             return ""
         
-        # Sort and join
-        if len(positions) > 1000:
-            import numpy as np
-            sort_idx = np.argsort(positions)
-            abstract_text = " ".join(np.array(words)[sort_idx])
-        else:
-            abstract_text = " ".join(word for _, word in sorted(zip(positions, words)))
+        # Fast path: n writes into n slots, all slots filled => every position was used exactly once
+        slots = [None] * total
+        try:
+            for word, pos_list in inverted_index.items():
+                for pos in pos_list:
+                    slots[pos] = word
+        except (IndexError, TypeError):  # out-of-range or non-int position
+            slots = None
+        if slots is not None and None not in slots:
+            return clean_text_field(" ".join(slots))
         
+        # Fill flat buffers: positions[i] is where words[i] goes
+        positions = np.empty(total, dtype=np.int64)
+        words = np.empty(total, dtype=object)
+        i = 0
+        for word, pos_list in inverted_index.items():
+            n = len(pos_list)
+            positions[i:i + n] = pos_list
+            words[i:i + n] = word
+            i += n
+        
+        abstract_text = " ".join(words[np.argsort(positions, kind="stable")])
         return clean_text_field(abstract_text)
     except Exception:
         return "[Abstract processing error]"
 
-def format_authors_simple(authorships: List[Dict]) -> str:
-    """Format authors information"""
-    if not authorships:
-        return ""
-    
+def format_authorships_bundle(authorships: List[Dict], author_id: Optional[str] = None) -> Dict[str, str]:
+    """
+    Format every authorship-derived field in a single pass over the list.
+    Returns {'authors', 'institutions', 'raw_affiliation_strings', 'position'}
+    (raw affiliations deduplicated in order of first appearance);
+    'position' is only resolved when author_id is given (First/Middle/Last/Not found).
+    """
     authors = []
-    for authorship in authorships:
-        author_name = authorship.get('author', {}).get('display_name', 'Unknown').strip()
+    institutions = []
+    seen_insts = set()
+    affiliations = {}  # insertion-ordered set
+    position = POS_NOT_FOUND if author_id else ""
+    author_id_clean = bare_id(author_id) if author_id else None
+    last_idx = len(authorships or []) - 1
+    
+    for i, authorship in enumerate(authorships or []):
+        author = authorship.get("author", {})
+        
+        # Authors
+        author_name = (author.get("display_name", "Unknown") or "").strip()
         if authorship.get("is_corresponding", False):
             author_name += " (corresponding)"
         authors.append(author_name)
-    
-    return " | ".join(authors)
-
-def format_institutions(authorships: List[Dict]) -> str:
-    """Format institutions with deduplication"""
-    if not authorships:
-        return ""
-    
-    seen = set()
-    institutions = []
-    
-    for authorship in authorships:
+        
+        # Position of the requested author (first match wins)
+        if author_id_clean and position == POS_NOT_FOUND:
+            if bare_id(author.get("id", "")) == author_id_clean:
+                position = POS_FIRST if i == 0 else POS_LAST if i == last_idx else POS_MIDDLE
+        
+        # Institutions (deduplicated by id)
         for inst in authorship.get("institutions", []):
             inst_id = inst.get("id", "")
-            if inst_id and inst_id not in seen:
-                seen.add(inst_id)
+            if inst_id and inst_id not in seen_insts:
+                seen_insts.add(inst_id)
                 inst_name = inst.get("display_name", "Unknown")
                 inst_type = inst.get("type", "Unknown")
                 inst_country = inst.get("country_code", "Unknown")
-                inst_id_clean = OPENALEX_PATTERN.sub('', inst_id)
-                institutions.append(f"{inst_name} ; {inst_type} ; {inst_country} ({inst_id_clean})")
-    
-    return " | ".join(institutions)
-
-def format_raw_affiliation_strings(authorships: List[Dict]) -> str:
-    """Format raw affiliation strings"""
-    if not authorships:
-        return ""
-    
-    affiliations = set()
-    for authorship in authorships:
+                institutions.append(f"{inst_name} ; {inst_type} ; {inst_country} ({inst_id})")
+        
+        # Raw affiliation strings
         for affiliation in authorship.get("raw_affiliation_strings", []):
             if affiliation and affiliation.strip():
                 clean_affiliation = clean_text_field(affiliation.strip())
-                clean_affiliation = unicodedata.normalize('NFC', clean_affiliation)
-                affiliations.add(clean_affiliation)
+                if not clean_affiliation.isascii():  # NFC is a no-op on ASCII
+                    clean_affiliation = unicodedata.normalize('NFC', clean_affiliation)
+                affiliations[clean_affiliation] = None
     
-    return " | ".join(sorted(affiliations))
+    return {
+        "authors": " | ".join(authors),
+        "institutions": " | ".join(institutions),
+        "raw_affiliation_strings": " | ".join(affiliations),
+        "position": position,
+    }
 
 def format_counts_by_year(counts: List[Dict]) -> str:
     """Format counts by year"""
     if not counts:
         return ""
     
-    return " | ".join(
-        f"{c.get('cited_by_count', 0)} ({c.get('year', 'Unknown')})"
+    # list (not genexpr): join sizes its buffer from a materialized sequence anyway
+    return " | ".join([
+        "%s (%s)" % (c.get('cited_by_count', 0), c.get('year', 'Unknown'))
         for c in sorted(counts, key=lambda x: x.get("year", 0), reverse=True)
-    )
+    ])
 
 def format_topic_and_score(topics: List[Dict]) -> str:
     """Format topics with scores"""
     if not topics:
         return ""
     
-    return " | ".join(
-        f"{t.get('display_name', 'Unknown')} ; {t.get('score', 0):.4f}"
+    return " | ".join([
+        "%s ; %.4f" % (t.get('display_name', 'Unknown'), t.get('score', 0))
         for t in topics
-    )
+    ])
+
+# OpenAlex concept levels run 0 (root) to 5
+CONCEPT_LEVELS = range(6)
 
 def format_concepts(concepts: List[Dict]) -> str:
-    """Format concepts"""
+    """Format concepts (grouped by level, shallowest first)"""
     if not concepts:
         return ""
     
-    concepts_by_level = {}
+    concepts_by_level = defaultdict(list)
     for concept in concepts:
         level = concept.get("level", 0)
-        if level not in concepts_by_level:
-            concepts_by_level[level] = []
         concepts_by_level[level].append(
-            f"{concept.get('display_name', 'Unknown')} ; {concept.get('score', 0):.4f} (level {level})"
+            "%s ; %.4f (level %s)" % (concept.get('display_name', 'Unknown'), concept.get('score', 0), level)
         )
     
-    return " | ".join(
-        item for level in sorted(concepts_by_level.keys())
-        for item in concepts_by_level[level]
-    )
+    # Known levels need no sort; anything unexpected falls back to sorting
+    levels = CONCEPT_LEVELS if all(l in CONCEPT_LEVELS for l in concepts_by_level) else sorted(concepts_by_level)
+    return " | ".join([
+        item for level in levels
+        for item in concepts_by_level.get(level, ())
+    ])
 
 def format_sdgs(sdgs: List[Dict]) -> str:
     """Format SDGs"""
     if not sdgs:
         return ""
     
-    return " | ".join(
-        f"{sdg.get('display_name', 'Unknown')} ; {sdg.get('score', 0):.2f}"
+    return " | ".join([
+        "%s ; %.2f" % (sdg.get('display_name', 'Unknown'), sdg.get('score', 0))
         for sdg in sdgs
-    )
+    ])
 
 def format_grants(grants: List[Dict]) -> str:
     """Format grants"""
@@ -155,22 +268,35 @@ def format_grants(grants: List[Dict]) -> str:
     for grant in grants:
         funder = grant.get("funder_display_name", "Unknown")
         award_id = grant.get("award_id", "")
-        formatted.append(f"{funder} ({award_id})" if award_id else funder)
+        formatted.append("%s (%s)" % (funder, award_id) if award_id else funder)
     
     return ", ".join(formatted)
 
+def bare_id(openalex_id: str) -> str:
+    """'https://openalex.org/A123' or 'a123' -> 'a123' (lower-case, no prefix)"""
+    return (openalex_id or "").removeprefix(OPENALEX_PREFIX).lower()
+
+def build_author_index(authorships: List[Dict]) -> Dict[str, int]:
+    """Map each author's bare id to its first index in the authorship list (one pass per work)."""
+    index: Dict[str, int] = {}
+    for i, authorship in enumerate(authorships or []):
+        auth_id = bare_id(authorship.get('author', {}).get('id', ''))
+        if auth_id:
+            index.setdefault(auth_id, i)
+    return index
+
+def position_from_index(index: Dict[str, int], n_authors: int, author_id: str) -> str:
+    """O(1) First/Middle/Last/Not found lookup against a prebuilt build_author_index()"""
+    i = index.get(bare_id(author_id))
+    if i is None:
+        return POS_NOT_FOUND
+    if i == 0:
+        return POS_FIRST
+    elif i == n_authors - 1:
+        return POS_LAST
+    return POS_MIDDLE
+
 def extract_author_position(pub: Dict, author_id: str) -> str:
     """Extract the position of an author in a publication"""
-    authorships = pub.get('authorships', [])
-    author_id_clean = author_id.lower()
-    
-    for i, authorship in enumerate(authorships):
-        auth_id = authorship.get('author', {}).get('id', '').lower()
-        if auth_id.endswith(author_id_clean):
-            if i == 0:
-                return "First"
-            elif i == len(authorships) - 1:
-                return "Last"
-            else:
-                return "Middle"
-    return "Not found"
\ No newline at end of file
+    authorships = pub.get('authorships', []) or []
+    return position_from_index(build_author_index(authorships), len(authorships), author_id)
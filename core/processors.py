@@ -1,189 +1,450 @@
 # core/processors.py
 """Data processing functions"""
 
-from typing import Dict, List, Any, Optional
-import pandas as pd
-import gc
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-from .api_client import MAX_WORKERS
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import sys
+from functools import lru_cache
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .api_client import EXECUTOR, MAILTO, MAX_WORKERS, PARALLEL_ENTITIES, fetch_works_cursor_page
 from .formatters import (
-    OPENALEX_PATTERN,
-    DOI_PATTERN,
     clean_text_field,
     format_abstract_optimized,
-    format_authors_simple,
-    format_institutions,
-    format_raw_affiliation_strings,
+    format_authorships_bundle,
     format_counts_by_year,
     format_topic_and_score,
     format_concepts,
     format_sdgs,
     format_grants,
     extract_author_position,
+    build_author_index,
+    position_from_index,
+    bare_id,
 )
 
+__all__ = [
+    "EXTRACTED_FIELDS",
+    "AUTHORSHIP_FIELDS",
+    "INTERNED_FIELDS",
+    "PER_PAGE",
+    "AUTHORS_PER_FILTER",
+    "make_path_getter",
+    "get_value_from_nested_dict",
+    "output_columns",
+    "build_mapper",
+    "iter_publications_batch",
+    "process_publications_batch",
+    "process_publications_for_authors",
+    "PublicationAggregator",
+    "deduplicate_publications_optimized",
+    "SeenWorkIds",
+    "fetch_single_doc_type",
+    "fetch_cursor_streams",
+    "fetch_publications_parallel",
+    "fetch_authors_batched",
+    "fetch_entities_parallel",
+]
+
 # -------------------- helpers --------------------
 
+def make_path_getter(key_path: str) -> Callable[[Dict], Any]:
+    """Build a getter for a dotted path: keys split once, no exception on the lookup path"""
+    keys = tuple(key_path.split("."))
+    
+    def get(data: Dict, _keys=keys) -> Any:
+        value = data
+        for key in _keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    return get
+
+@lru_cache(maxsize=512)
+def _get_path_getter(key_path: str) -> Callable[[Dict], Any]:
+    return make_path_getter(key_path)
+
 def get_value_from_nested_dict(data: Dict, key_path: str) -> Any:
     """Extract value from nested dictionary"""
     if not data or not key_path:
         return None
-    keys = key_path.split(".")
-    value = data
-    for key in keys:
-        if value is None:
-            return None
-        try:
-            value = value.get(key)
-        except AttributeError:
-            return None
-    return value
+    return _get_path_getter(key_path)(data)
 
 
 # -------------------- batch processing --------------------
 
-def process_publications_batch(
+# Entity stamps added to every row, after the selected metadata
+EXTRACTED_FIELDS = ["institutions_extracted", "authors_extracted", "position_extracted"]
+
+def output_columns(selected_metadata: List[str]) -> List[str]:
+    """Final column order of a retrieval: id, the other selected fields, then the entity stamps."""
+    return ["id"] + [f for f in selected_metadata if f != "id"] + EXTRACTED_FIELDS
+
+# Output fields derived from 'authorships' (served by one format_authorships_bundle pass)
+AUTHORSHIP_FIELDS = {
+    "authorships": "authors",
+    "institutions": "institutions",
+    "raw_affiliation_strings": "raw_affiliation_strings",
+}
+
+# Output fields read from another top-level work key than their own first path segment
+_SELECT_SOURCES = {
+    "primary_topic_and_score": "primary_topic",
+    "institutions": "authorships",
+    "raw_affiliation_strings": "authorships",
+}
+
+def _top_level_fields_needed(selected_metadata: List[str], entity_type: str) -> List[str]:
+    """
+    Top-level work keys to request with select=: id (dedup), whatever the selected fields read,
+    and authorships + is_authors_truncated for authors (position stamp, OR-batch routing) even when not selected.
+    """
+    needed = {"id": None}  # insertion-ordered set
+    if entity_type != "institution":
+        needed["authorships"] = None
+        needed["is_authors_truncated"] = None  # authorships past 100 are cut from list responses
+    for field in selected_metadata:
+        needed[_SELECT_SOURCES.get(field, field.split(".", 1)[0])] = None
+    return list(needed)
+
+# Field handlers: (pub, authorships bundle) -> value, resolved once per batch
+_topic_name = _get_path_getter("primary_topic.display_name")
+_topic_score = _get_path_getter("primary_topic.score")
+
+def _primary_topic_and_score(pub: Dict, bundle: Optional[Dict]) -> str:
+    topic_name = _topic_name(pub)
+    topic_score = _topic_score(pub)
+    return f"{topic_name} ; {topic_score:.4f}" if topic_name and topic_score is not None else ""
+
+def _source_handler(field: str) -> Callable[[Dict, Optional[Dict]], Any]:
+    """primary_location.source.* fields: ISSN list joined, strings cleaned, other values kept as is"""
+    get = _get_path_getter(field)
+    if field == "primary_location.source.issn":
+        return lambda pub, bundle: ",".join(get(pub) or [])
+    
+    def handler(pub: Dict, bundle: Optional[Dict]) -> Any:
+        value = get(pub)
+        return clean_text_field(value) if isinstance(value, str) else value
+    return handler
+
+def _generic_handler(field: str) -> Callable[[Dict, Optional[Dict]], Any]:
+    """Any other dotted path: strings cleaned, other non-null values stringified"""
+    get = _get_path_getter(field)
+    
+    def handler(pub: Dict, bundle: Optional[Dict]) -> Any:
+        value = get(pub)
+        if isinstance(value, str):
+            return clean_text_field(value)
+        return str(value) if value is not None else None
+    return handler
+
+_FIELD_HANDLERS: Dict[str, Callable[[Dict, Optional[Dict]], Any]] = {
+    "id": lambda pub, bundle: pub.get("id", ""),
+    "doi": lambda pub, bundle: pub.get("doi", "") or "",
+    "display_name": lambda pub, bundle: clean_text_field(pub.get("display_name", "")),
+    "abstract_inverted_index": lambda pub, bundle: format_abstract_optimized(pub.get("abstract_inverted_index", {})),
+    **{field: (lambda pub, bundle, _key=key: bundle[_key]) for field, key in AUTHORSHIP_FIELDS.items()},
+    "primary_topic_and_score": _primary_topic_and_score,
+    "corresponding_author_ids": lambda pub, bundle: " | ".join(pub.get("corresponding_author_ids", [])),
+    "corresponding_institution_ids": lambda pub, bundle: " | ".join(pub.get("corresponding_institution_ids", [])),
+    "counts_by_year": lambda pub, bundle: format_counts_by_year(pub.get("counts_by_year", [])),
+    "topics": lambda pub, bundle: format_topic_and_score(pub.get("topics", [])),
+    "concepts": lambda pub, bundle: format_concepts(pub.get("concepts", [])),
+    "sustainable_development_goals": lambda pub, bundle: format_sdgs(pub.get("sustainable_development_goals", [])),
+    "grants": lambda pub, bundle: format_grants(pub.get("grants", [])),
+    "datasets": lambda pub, bundle: ", ".join(pub.get("datasets", [])),
+}
+
+# Fields with few distinct values across a whole retrieval (codes, flags, years, venue and
+# taxonomy names): their strings are interned, so all rows share one object per distinct value
+INTERNED_FIELDS = frozenset({
+    "publication_year",
+    "language",
+    "type",
+    "has_fulltext",
+    "is_retracted",
+    "open_access.is_oa",
+    "open_access.oa_status",
+    "primary_location.source.display_name",
+    "primary_location.source.type",
+    "primary_location.source.issn",
+    "primary_location.source.host_organization_name",
+    "primary_location.license",
+    "citation_normalized_percentile.is_in_top_1_percent",
+    "citation_normalized_percentile.is_in_top_10_percent",
+    "primary_topic.subfield.display_name",
+    "primary_topic.field.display_name",
+    "primary_topic.domain.display_name",
+})
+
+def _interned(handler: Callable[[Dict, Optional[Dict]], Any]) -> Callable[[Dict, Optional[Dict]], Any]:
+    def intern_handler(pub: Dict, bundle: Optional[Dict]) -> Any:
+        value = handler(pub, bundle)
+        return sys.intern(value) if type(value) is str else value
+    return intern_handler
+
+def _field_handler(field: str) -> Callable[[Dict, Optional[Dict]], Any]:
+    """Resolve the handler of one output field (table first, then source paths, then generic)."""
+    handler = _FIELD_HANDLERS.get(field)
+    if handler is None:
+        handler = _source_handler(field) if field.startswith("primary_location.source") else _generic_handler(field)
+    return _interned(handler) if field in INTERNED_FIELDS else handler
+
+@lru_cache(maxsize=64)
+def build_mapper(selected_metadata: Tuple[str, ...]) -> Callable[..., Dict]:
+    """
+    Specialize the row mapper for one exact metadata selection (fixed for a whole retrieval):
+    a generated function returning a single dict display, stamps first, then one resolved handler
+    call per field, so there is no per-row loop over fields.
+    mapper(pub, bundle, institutions_extracted, authors_extracted, position_extracted) -> row
+    Only handler names and repr()'d field names go into the generated source.
+    """
+    namespace: Dict[str, Any] = {}
+    lines = [
+        "def _mapper(pub, bundle, institutions_extracted, authors_extracted, position_extracted):",
+        "    return {",
+        "        'institutions_extracted': institutions_extracted,",
+        "        'authors_extracted': authors_extracted,",
+        "        'position_extracted': position_extracted,",
+    ]
+    for i, field in enumerate(selected_metadata):
+        namespace[f"_h{i}"] = _field_handler(field)
+        lines.append(f"        {field!r}: '' if (_v{i} := _h{i}(pub, bundle)) is None else _v{i},")
+    lines.append("    }")
+    exec(compile("\n".join(lines), "<process_publications_batch mapper>", "exec"), namespace)
+    return namespace["_mapper"]
+
+def _restamp(row: Dict, institutions_extracted: str, authors_extracted: str, position_extracted: str) -> Dict:
+    """Copy of an already formatted row with another entity's stamps (key order kept)."""
+    return {
+        **row,
+        "institutions_extracted": institutions_extracted,
+        "authors_extracted": authors_extracted,
+        "position_extracted": position_extracted,
+    }
+
+def iter_publications_batch(
     results: List[Dict],
     entity_id: str,
     entity_name: str,
     entity_type: str,
     selected_metadata: List[str],
-) -> List[Dict]:
+    formatted: Optional[Dict[str, Dict]] = None,
+) -> Iterator[Dict]:
     """
-    Process publications and stamp them with the triggering entity:
+    Process publications and stamp them with the triggering entity, one row at a time:
       - for institutions: institutions_extracted = entity_name
       - for authors: authors_extracted = <Name, Surname from input>, position_extracted = First/Middle/Last
+    Works are expected with bare ids (canonicalize_ids, applied by fetch_works_cursor_page).
+    `formatted` (work id -> row, shared by every entity of a retrieval) lets a work found again by
+    another entity skip its formatters: the first row is only restamped.
     """
-    publications: List[Dict] = []
+    needs_bundle = any(f in AUTHORSHIP_FIELDS for f in selected_metadata)
+    # Dispatch resolved once per selection, not per field per publication
+    mapper = build_mapper(tuple(selected_metadata))
+    is_institution = entity_type == "institution"
 
     for pub in results:
-        pub_data: Dict[str, Any] = {}
-
-        if entity_type == "institution":
-            pub_data["institutions_extracted"] = entity_name
-            pub_data["authors_extracted"] = ""
-            pub_data["position_extracted"] = ""
-        else:  # author
-            pub_data["institutions_extracted"] = ""
-            # entity_name is now "Name, Surname" coming from UI (file label)
-            pub_data["authors_extracted"] = entity_name
-            pub_data["position_extracted"] = extract_author_position(pub, entity_id)
-
-        for field in selected_metadata:
-            if field == "id":
-                value = OPENALEX_PATTERN.sub("", pub.get("id", ""))
-            elif field == "doi":
-                doi = pub.get("doi", "")
-                value = DOI_PATTERN.sub("", doi) if doi else ""
-            elif field == "display_name":
-                value = clean_text_field(pub.get("display_name", ""))
-            elif field == "abstract_inverted_index":
-                value = format_abstract_optimized(pub.get("abstract_inverted_index", {}))
-            elif field == "authorships":
-                value = format_authors_simple(pub.get("authorships", []))
-            elif field == "institutions":
-                value = format_institutions(pub.get("authorships", []))
-            elif field == "raw_affiliation_strings":
-                value = format_raw_affiliation_strings(pub.get("authorships", []))
-            elif field == "primary_topic_and_score":
-                topic_name = get_value_from_nested_dict(pub, "primary_topic.display_name")
-                topic_score = get_value_from_nested_dict(pub, "primary_topic.score")
-                value = f"{topic_name} ; {topic_score:.4f}" if topic_name and topic_score is not None else ""
-            elif field.startswith("primary_location.source"):
-                value = get_value_from_nested_dict(pub, field)
-                if field == "primary_location.source.issn":
-                    issns = value or []
-                    value = ",".join(issns)
-                else:
-                    value = clean_text_field(value) if isinstance(value, str) else value
-            elif field == "corresponding_author_ids":
-                ids = pub.get("corresponding_author_ids", [])
-                value = " | ".join(OPENALEX_PATTERN.sub("", i) for i in ids)
-            elif field == "corresponding_institution_ids":
-                ids = pub.get("corresponding_institution_ids", [])
-                value = " | ".join(OPENALEX_PATTERN.sub("", i) for i in ids)
-            elif field == "counts_by_year":
-                value = format_counts_by_year(pub.get("counts_by_year", []))
-            elif field == "topics":
-                value = format_topic_and_score(pub.get("topics", []))
-            elif field == "concepts":
-                value = format_concepts(pub.get("concepts", []))
-            elif field == "sustainable_development_goals":
-                value = format_sdgs(pub.get("sustainable_development_goals", []))
-            elif field == "grants":
-                value = format_grants(pub.get("grants", []))
-            elif field == "datasets":
-                value = ", ".join(pub.get("datasets", []))
+        work_id = pub.get("id")
+        cached = formatted.get(work_id) if formatted is not None and work_id else None
+        bundle = None
+
+        if is_institution:
+            if cached is None and needs_bundle:
+                bundle = format_authorships_bundle(pub.get("authorships", []), None)
+            stamps = (entity_name, "", "")
+        else:  # author: entity_name is "Name, Surname" coming from UI (file label)
+            if cached is None and needs_bundle:
+                bundle = format_authorships_bundle(pub.get("authorships", []), entity_id)
+                position = bundle["position"]
             else:
-                value = get_value_from_nested_dict(pub, field)
-                if isinstance(value, str):
-                    value = clean_text_field(value)
-                elif value is not None and not isinstance(value, str):
-                    value = str(value)
+                position = extract_author_position(pub, entity_id)
+            stamps = ("", entity_name, position)
 
-            pub_data[field] = value if value is not None else ""
+        if cached is not None:
+            yield _restamp(cached, *stamps)
+            continue
+        row = mapper(pub, bundle, *stamps)
+        if formatted is not None and work_id:
+            # dict.setdefault is atomic; two entities racing on one work at worst both format it
+            formatted.setdefault(work_id, row)
+        yield row
 
-        publications.append(pub_data)
 
-    return publications
+def process_publications_batch(
+    results: List[Dict],
+    entity_id: str,
+    entity_name: str,
+    entity_type: str,
+    selected_metadata: List[str],
+    formatted: Optional[Dict[str, Dict]] = None,
+) -> List[Dict]:
+    """iter_publications_batch as a list (for callers that keep the page, e.g. fetch_cursor_streams)."""
+    return list(iter_publications_batch(results, entity_id, entity_name, entity_type, selected_metadata, formatted))
+
+
+def process_publications_for_authors(
+    results: List[Dict],
+    authors: Dict[str, List[Tuple[int, str]]],
+    selected_metadata: List[str],
+    formatted: Optional[Dict[str, Dict]] = None,
+    truncated: Optional[Dict[str, Dict]] = None,
+) -> List[Tuple[int, Dict]]:
+    """
+    Route works fetched with an OR filter over several authors back to each author they contain.
+    authors maps bare lower-case author id -> [(slot, "Name, Surname")] (one id may be selected
+    under several input labels); returns (slot, row) pairs, one per (work, matching author slot),
+    rows stamped as process_publications_batch would. A work is formatted once, then restamped
+    for every further match (and for other entities, through the shared `formatted`).
+    Works whose authorships were truncated (is_authors_truncated) and lack some author of the
+    batch are also collected into `truncated` (work id -> work): that author may be past the cut.
+    """
+    needs_bundle = any(f in AUTHORSHIP_FIELDS for f in selected_metadata)
+    mapper = build_mapper(tuple(selected_metadata))
+    routed: List[Tuple[int, Dict]] = []
+
+    for pub in results:
+        authorships = pub.get("authorships", []) or []
+        index = build_author_index(authorships)
+        work_id = pub.get("id")
+        if truncated is not None and work_id and pub.get("is_authors_truncated") \
+                and any(author_id not in index for author_id in authors):
+            truncated[work_id] = pub
+        base = formatted.get(work_id) if formatted is not None and work_id else None
+        for author_id in index:
+            matches = authors.get(author_id)
+            if not matches:
+                continue
+            position = position_from_index(index, len(authorships), author_id)
+            for slot, name in matches:
+                if base is None:
+                    # the authorships-derived fields don't depend on the author: one bundle serves every match
+                    bundle = format_authorships_bundle(authorships, None) if needs_bundle else None
+                    base = mapper(pub, bundle, "", name, position)
+                    if formatted is not None and work_id:
+                        formatted.setdefault(work_id, base)
+                    routed.append((slot, base))
+                else:
+                    routed.append((slot, _restamp(base, "", name, position)))
+
+    return routed
 
 
 # -------------------- deduplication --------------------
 
-def deduplicate_publications_optimized(all_publications: List[Dict]) -> List[Dict]:
+class PublicationAggregator:
     """
-    Merge duplicates by work id.
-    - Combine institutions (set)
-    - Combine matched authors from the user list (map: 'Name, Surname' -> position)
-    - Output aligned pipes: 'Authors Extracted' and 'Author Position'
+    Streaming merge by work id: add() each entity's rows as the entity completes, finalize() once.
+    Rows are grouped on arrival, so no concatenated list of every entity's rows is ever built.
+    Not thread-safe by design: feed it from the caller's thread (e.g. fetch_entities_parallel's entity_callback).
     """
-    seen: Dict[str, Dict] = {}
 
-    for pub in all_publications:
-        pub_id = pub.get("id", "")
-        if not pub_id:
-            continue
+    def __init__(self) -> None:
+        self._groups: Dict[str, List[Dict]] = {}
+        self.rows_added = 0
+
+    def add(self, publications: List[Dict]) -> None:
+        """Group rows by id (rows without an id are dropped)."""
+        groups = self._groups
+        for pub in publications:
+            pub_id = pub.get("id", "")
+            if not pub_id:
+                continue
+            group = groups.get(pub_id)
+            if group is None:
+                groups[pub_id] = [pub]
+            else:
+                group.append(pub)
+        self.rows_added += len(publications)
+
+    def __len__(self) -> int:
+        """Number of distinct work ids so far."""
+        return len(self._groups)
+
+    def finalize(self) -> List[Dict]:
+        """
+        One merged row per work id, in order of first arrival:
+        - Combine institutions (set)
+        - Combine matched authors from the user list (map: 'Name, Surname' -> position)
+        - Output aligned pipes: 'Authors Extracted' and 'Author Position'
+        Ids seen once (the common case) skip the merge state.
+        Consumes the added rows: each work's first row is updated in place and returned.
+        """
+        result: List[Dict] = []
+        # Works found by the same set of entities share one merged-stamp string per distinct value
+        shared: Dict[str, str] = {}
+        share = shared.setdefault
+        for rows in self._groups.values():
+            row = rows[0]  # no copy: the rows are not read again once merged
+
+            if len(rows) == 1:
+                author_label = (row.get("authors_extracted") or "").strip()
+                row["institutions_extracted"] = (row.get("institutions_extracted") or "").strip()
+                row["authors_extracted"] = author_label
+                row["position_extracted"] = (row.get("position_extracted") or "").strip() if author_label else ""
+                result.append(row)
+                continue
+
+            institutions = set()
+            author_positions: Dict[str, str] = {}  # { "Name, Surname": "First/Middle/Last/Not found" }
+            for pub in rows:
+                inst = (pub.get("institutions_extracted") or "").strip()
+                if inst:
+                    institutions.add(inst)
+
+                author_label = (pub.get("authors_extracted") or "").strip()    # "Name, Surname"
+                # don't overwrite an existing position unless the new one is non-empty
+                if author_label and not author_positions.get(author_label):
+                    author_positions[author_label] = (pub.get("position_extracted") or "").strip()
+
+            # sort authors alphabetically for a stable order
+            author_labels = sorted(author_positions)
+
+            inst_joined = " | ".join(sorted(institutions))
+            authors_joined = " | ".join(author_labels)
+            positions_joined = " | ".join([author_positions[a] for a in author_labels])
+            row["institutions_extracted"] = share(inst_joined, inst_joined)
+            row["authors_extracted"] = share(authors_joined, authors_joined)
+            row["position_extracted"] = share(positions_joined, positions_joined)
+
+            result.append(row)
+
+        return result
 
-        entry = seen.get(pub_id)
-        if not entry:
-            entry = {
-                "data": pub,
-                "institutions": set(),
-                "author_positions": {},  # { "Name, Surname": "First/Middle/Last/Not found" }
-            }
-            seen[pub_id] = entry
 
-        inst = (pub.get("institutions_extracted") or "").strip()
-        if inst:
-            entry["institutions"].add(inst)
+def deduplicate_publications_optimized(all_publications: List[Dict]) -> List[Dict]:
+    """Merge duplicates by work id in one go (see PublicationAggregator for the streaming form; input rows are consumed)."""
+    aggregator = PublicationAggregator()
+    aggregator.add(all_publications)
+    return aggregator.finalize()
 
-        author_label = (pub.get("authors_extracted") or "").strip()    # "Name, Surname"
-        position = (pub.get("position_extracted") or "").strip()
-        if author_label:
-            # don't overwrite an existing position unless the new one is non-empty
-            if author_label not in entry["author_positions"] or not entry["author_positions"][author_label]:
-                entry["author_positions"][author_label] = position
 
-    # Build final rows
-    result: List[Dict] = []
-    for item in seen.values():
-        row = item["data"].copy()
+# -------------------- fetching --------------------
 
-        inst_list = sorted(filter(None, item["institutions"]))
-        # sort authors alphabetically for a stable order
-        author_labels = sorted(item["author_positions"].keys())
+PER_PAGE = 200  # OpenAlex maximum for cursor paging
 
-        row["institutions_extracted"] = " | ".join(inst_list)
-        row["authors_extracted"] = " | ".join(author_labels)
-        row["position_extracted"] = " | ".join(item["author_positions"].get(a, "") for a in author_labels)
 
-        result.append(row)
+class SeenWorkIds:
+    """Work ids already taken by one entity's streams; thread-safe check-and-add, shared by its workers."""
 
-    return result
+    def __init__(self) -> None:
+        self._ids: set = set()
+        self._lock = threading.Lock()
 
+    def claim(self, works: List[Dict]) -> List[Dict]:
+        """Keep (and take) the works whose id is new, in page order; works without an id are dropped."""
+        fresh: List[Dict] = []
+        with self._lock:
+            ids = self._ids
+            for work in works:
+                work_id = work.get("id")
+                if work_id and work_id not in ids:
+                    ids.add(work_id)
+                    fresh.append(work)
+        return fresh
 
-# -------------------- fetching --------------------
 
 def fetch_single_doc_type(
     session,
@@ -196,59 +457,228 @@ def fetch_single_doc_type(
     selected_metadata: List[str],
     page_callback=None,
     request_callback=None,
+    seen: Optional[SeenWorkIds] = None,
+    formatted: Optional[Dict[str, Dict]] = None,
 ) -> List[Dict]:
     """
-    Fetch publications for a single document type.
+    Fetch publications for a single document type by walking the cursor to the end.
     - page_callback(int_added) is called after each page to increment the UI counter
     - request_callback(ok: bool) is called after each HTTP attempt
+    Pages are requested one ahead, so network time overlaps with mapping.
+    With `seen`, works already taken by another stream of the entity are skipped before mapping.
     """
-    from .api_client import MAILTO, fetch_works_page
-
     filter_str = f"{base_filter_str},type:{doc_type}" if doc_type else base_filter_str
     params = {
         "filter": filter_str,
-        "per_page": 50,
+        "per_page": PER_PAGE,
+        "cursor": "*",
+        "select": ",".join(_top_level_fields_needed(selected_metadata, entity_type)),
         "mailto": MAILTO,
     }
 
     publications: List[Dict] = []
 
-    # First page
-    results, total_count, success = fetch_works_page(session, url, params)
-    if request_callback:
-        request_callback(bool(success))
-    if not success:
-        return publications
+    # One-page lookahead: as soon as a page's cursor is known, the next request goes out on
+    # the shared EXECUTOR while this thread maps the current page (callbacks stay on this thread)
+    pending = EXECUTOR.submit(fetch_works_cursor_page, session, url, dict(params))
 
-    if page_callback:
-        page_callback(len(results))
+    while pending is not None:
+        results, _, next_cursor, success = pending.result()
+        pending = None
 
-    publications.extend(
-        process_publications_batch(results, entity_id, entity_name, entity_type, selected_metadata)
+        if request_callback:
+            request_callback(bool(success))
+
+        # a failed page breaks the cursor chain (retries already happened in rate_limited_get)
+        if not success:
+            break
+
+        if results and next_cursor:
+            params["cursor"] = next_cursor
+            pending = EXECUTOR.submit(fetch_works_cursor_page, session, url, dict(params))
+
+        if page_callback:
+            page_callback(len(results))
+        if seen is not None:
+            results = seen.claim(results)
+        # rows stream straight into the result list, no intermediate per-page list
+        publications.extend(
+            iter_publications_batch(results, entity_id, entity_name, entity_type, selected_metadata, formatted)
+        )
+
+    return publications
+
+
+def _submit_cursor_streams(
+    session,
+    url: str,
+    streams: List[Tuple[str, Optional[str]]],
+    map_page: Callable[[List[Dict]], List[Any]],
+    page_callback=None,
+    request_callback=None,
+    seen: Optional[SeenWorkIds] = None,
+    max_workers: int = MAX_WORKERS,
+    select: Optional[str] = None,
+) -> Tuple[List[Any], Callable[[], List[Any]]]:
+    """
+    Start the fetch_cursor_streams workers on a pool of their own without waiting for them.
+    Returns (worker_futures, collect): once every future is done, collect() gives the items,
+    or re-raises the first error a worker hit outside HTTP (map_page, seen, a callback).
+    """
+    if not streams:
+        return [], list
+
+    n_workers = min(max_workers, len(streams))
+    tasks: "queue.Queue" = queue.Queue()
+    pages: List[Dict[int, List[Any]]] = [{} for _ in streams]  # per stream: page number -> items
+    live_streams = len(streams)
+    live_lock = threading.Lock()
+    errors: List[Exception] = []  # failed pages are not errors: they only end their stream
+
+    for i in range(len(streams)):
+        tasks.put((i, "*", 0))
+
+    def worker() -> None:
+        nonlocal live_streams
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            i, cursor, page_no = task
+            base_filter_str, doc_type = streams[i]
+            continued = False
+            try:
+                filter_str = f"{base_filter_str},type:{doc_type}" if doc_type else base_filter_str
+                params = {"filter": filter_str, "per_page": PER_PAGE, "cursor": cursor, "mailto": MAILTO}
+                if select:
+                    params["select"] = select
+                results, _, next_cursor, success = fetch_works_cursor_page(session, url, params)
+
+                if request_callback:
+                    request_callback(bool(success))
+                # a failed page ends its stream (retries already happened in rate_limited_get)
+                if not success:
+                    continue
+
+                if results and next_cursor:
+                    tasks.put((i, next_cursor, page_no + 1))
+                    continued = True
+
+                if page_callback:
+                    page_callback(len(results))
+                if seen is not None:
+                    results = seen.claim(results)
+                pages[i][page_no] = map_page(results)
+            except Exception as exc:
+                # a bug, not a failed page: recorded, the streams drain, then collect() re-raises it
+                errors.append(exc)
+            finally:
+                if not continued:
+                    with live_lock:
+                        live_streams -= 1
+                        if live_streams == 0:
+                            for _ in range(n_workers):
+                                tasks.put(None)  # every stream is done: release the workers
+
+    def collect() -> List[Any]:
+        if errors:
+            raise errors[0]
+        return [item for stream_pages in pages for page_no in sorted(stream_pages) for item in stream_pages[page_no]]
+
+    # Workers block on the task queue between pages, so they stay off the shared EXECUTOR (leaf work
+    # only); the pool is shut down right away and its threads exit as soon as the streams are done
+    pool = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="openalex-streams")
+    futures = [pool.submit(worker) for _ in range(n_workers)]
+    pool.shutdown(wait=False)
+    return futures, collect
+
+
+def fetch_cursor_streams(
+    session,
+    url: str,
+    streams: List[Tuple[str, Optional[str]]],
+    map_page: Callable[[List[Dict]], List[Any]],
+    page_callback=None,
+    request_callback=None,
+    seen: Optional[SeenWorkIds] = None,
+    max_workers: int = MAX_WORKERS,
+    select: Optional[str] = None,
+) -> List[Any]:
+    """
+    Walk several cursor streams, streams = [(base_filter_str, doc_type)], with max_workers workers;
+    map_page(works) turns each page into output items (e.g. process_publications_batch rows).
+    select is the works select= list (default: WORKS_SELECT, see fetch_works_cursor_page).
+    Each page is one task on a FIFO queue; its continuation (next cursor) is queued as soon as the
+    page arrives, before mapping. Every stream starts right away, a long-tailed stream never waits
+    behind short ones, and another worker can fetch its next page while this one maps.
+    Callbacks are called from the workers (pass thread-safe ones, e.g. _relay_callbacks).
+    Returns the items stream by stream, pages in cursor order; a worker error other than a failed
+    page is re-raised here once every stream has drained.
+    """
+    futures, collect = _submit_cursor_streams(
+        session, url, streams, map_page, page_callback, request_callback, seen, max_workers, select
     )
+    wait(futures)
+    return collect()
 
-    per_page = 50
-    total_pages = min((total_count + per_page - 1) // per_page, 200)
 
-    # Remaining pages
-    for page in range(2, total_pages + 1):
-        params["page"] = page
-        results, _, success = fetch_works_page(session, url, params)
+YEAR_SLICE_MIN_WORKS = 2000  # works (10 full pages) above which an institution is fetched one year per stream
 
-        if request_callback:
-            request_callback(bool(success))
 
-        if success:
-            if page_callback:
-                page_callback(len(results))
-            publications.extend(
-                process_publications_batch(results, entity_id, entity_name, entity_type, selected_metadata)
-            )
+def _year_filters(start_year: int, end_year: int, slice_years: bool) -> List[str]:
+    """
+    Year slices fetched as independent cursor streams: one per year when slice_years
+    (a large output then downloads in parallel), else a single range.
+    """
+    if slice_years and end_year > start_year:
+        return [f"publication_year:{year}" for year in range(start_year, end_year + 1)]
+    return [f"publication_year:{start_year}-{end_year}"]
 
-        if len(publications) % 5000 == 0:
-            gc.collect()
 
-    return publications
+def _needs_year_slices(session, url: str, base_filter_str: str, doc_types: List[str], request_callback=None) -> bool:
+    """
+    True when the unsliced query (every doc type) matches more than YEAR_SLICE_MIN_WORKS works,
+    read from meta.count of a one-result page; below that, per-year streams would only add requests.
+    If the count cannot be read, slice (the output may be large).
+    """
+    filter_str = f"{base_filter_str},type:{'|'.join(doc_types)}" if doc_types else base_filter_str
+    params = {"filter": filter_str, "per_page": 1, "select": "id", "mailto": MAILTO}
+    _, total, _, success = fetch_works_cursor_page(session, url, params)
+    if request_callback:
+        request_callback(bool(success))
+    return not success or total > YEAR_SLICE_MIN_WORKS
+
+
+def _drain_events(events: "queue.Queue", page_callback=None, request_callback=None) -> None:
+    """Replay progress events queued by worker threads on the calling (UI) thread."""
+    while True:
+        try:
+            kind, value = events.get_nowait()
+        except queue.Empty:
+            return
+        if kind == "page" and page_callback:
+            page_callback(value)
+        elif kind == "request" and request_callback:
+            request_callback(value)
+
+
+def _relay_callbacks(events: "queue.Queue", page_callback=None, request_callback=None):
+    """Thread-safe stand-ins for the callbacks: workers only enqueue, the caller replays."""
+    relay_page = (lambda n: events.put(("page", n))) if page_callback else None
+    relay_request = (lambda ok: events.put(("request", ok))) if request_callback else None
+    return relay_page, relay_request
+
+
+def _wait_relaying(futures, events: "queue.Queue", page_callback=None, request_callback=None, done_callback=None) -> None:
+    """Wait for futures while replaying worker events; done_callback(future) runs here as each one finishes."""
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+        _drain_events(events, page_callback, request_callback)
+        if done_callback:
+            for f in done:
+                done_callback(f)
+    _drain_events(events, page_callback, request_callback)
 
 
 def fetch_publications_parallel(
@@ -263,11 +693,14 @@ def fetch_publications_parallel(
     language_filter: str,
     page_callback=None,
     request_callback=None,
+    formatted: Optional[Dict[str, Dict]] = None,
 ) -> List[Dict]:
     """
     Fetch publications for an entity (institution or author).
-    If callbacks are provided, we run sequentially (so the UI can update on each page).
-    Otherwise we keep the original parallel-per-doc-type behavior.
+    Each (year slice, doc type) pair is an independent cursor stream; streams share a page-level
+    worker pool (fetch_cursor_streams) and callbacks are relayed back to the caller's thread,
+    so the UI can still update on each page.
+    `formatted` is the retrieval-wide cache of formatted rows (see process_publications_batch).
     """
     if entity_id.startswith("https://openalex.org/"):
         entity_id = entity_id.split("/")[-1]
@@ -281,81 +714,246 @@ def fetch_publications_parallel(
     else:  # author
         entity_filter = f"authorships.author.id:{entity_id}"
 
-    base_filter_parts = [
-        entity_filter,
-        f"publication_year:{start_year}-{end_year}",
-    ]
+    extra_filter_parts = []
     if language_filter == "english_only":
-        base_filter_parts.append("language:en")
-
-    base_filter_str = ",".join(base_filter_parts)
+        extra_filter_parts.append("language:en")
+
+    # Institutions are split per year only when their output is large (one count request decides);
+    # authors keep a single range, where slicing would only add requests
+    slice_years = entity_type == "institution" and end_year > start_year and _needs_year_slices(
+        session,
+        url,
+        ",".join([entity_filter, f"publication_year:{start_year}-{end_year}"] + extra_filter_parts),
+        doc_types,
+        request_callback,
+    )
+    tasks = [
+        (",".join([entity_filter, year_filter] + extra_filter_parts), doc_type)
+        for year_filter in _year_filters(start_year, end_year, slice_years)
+        for doc_type in (doc_types or [None])  # None = all-works mode
+    ]
     all_publications: List[Dict] = []
+    # Duplicates within the entity (same id across streams) are dropped at ingest
+    seen = SeenWorkIds()
+
+    if len(tasks) == 1:
+        base_filter_str, doc_type = tasks[0]
+        all_publications.extend(
+            fetch_single_doc_type(
+                session,
+                url,
+                base_filter_str,
+                doc_type,
+                entity_id,
+                entity_name,
+                entity_type,
+                selected_metadata,
+                page_callback=page_callback,
+                request_callback=request_callback,
+                seen=seen,
+                formatted=formatted,
+            )
+        )
+    else:
+        # Workers must not touch the UI: they queue events, we replay them here
+        events: "queue.Queue" = queue.Queue()
+        relay_page, relay_request = _relay_callbacks(events, page_callback, request_callback)
 
-    # All-works mode
-    if not doc_types:
-        publications = fetch_single_doc_type(
+        # No runner thread: the stream workers are started here, this thread relays and collects
+        futures, collect = _submit_cursor_streams(
             session,
             url,
-            base_filter_str,
-            None,
-            entity_id,
-            entity_name,
-            entity_type,
-            selected_metadata,
-            page_callback=page_callback,
-            request_callback=request_callback,
+            tasks,
+            lambda works: process_publications_batch(
+                works, entity_id, entity_name, entity_type, selected_metadata, formatted
+            ),
+            relay_page,
+            relay_request,
+            seen,
+            select=",".join(_top_level_fields_needed(selected_metadata, entity_type)),
         )
-        all_publications.extend(publications)
+        _wait_relaying(futures, events, page_callback, request_callback)
+        all_publications.extend(collect())
 
-    else:
-        # If no live UI callbacks, we can safely parallelize per doc type
-        if page_callback is None and request_callback is None:
-            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(doc_types))) as executor:
-                futures = []
-                for doc_type in doc_types:
-                    futures.append(
-                        executor.submit(
-                            fetch_single_doc_type,
-                            session,
-                            url,
-                            base_filter_str,
-                            doc_type,
-                            entity_id,
-                            entity_name,
-                            entity_type,
-                            selected_metadata,
-                            None,
-                            None,
-                        )
-                    )
-                for f in as_completed(futures):
-                    try:
-                        all_publications.extend(f.result())
-                    except Exception as e:
-                        # swallow; counting of failed HTTP is done inside fetch_works_page path
-                        pass
-        else:
-            # Sequential when we want live page/call updates
-            for doc_type in doc_types:
-                publications = fetch_single_doc_type(
-                    session,
-                    url,
-                    base_filter_str,
-                    doc_type,
-                    entity_id,
-                    entity_name,
-                    entity_type,
-                    selected_metadata,
-                    page_callback=page_callback,
-                    request_callback=request_callback,
-                )
-                all_publications.extend(publications)
-
-    # Remove duplicates within entity (same id appearing across doc types)
-    unique_publications: Dict[str, Dict] = {}
-    for pub in all_publications:
-        pub_id = pub.get("id", "")
-        if pub_id and pub_id not in unique_publications:
-            unique_publications[pub_id] = pub
-
-    return list(unique_publications.values())
+    return all_publications
+
+
+AUTHORS_PER_FILTER = 25  # authors OR-ed into one works filter (authorships.author.id:a1|a2|...)
+WORKS_PER_ID_FILTER = 100  # work ids OR-ed into one ids.openalex filter (OpenAlex allows 100 OR values)
+
+
+def _authored_chunk(session, url: str, author_id: str, work_ids: List[str]) -> Tuple[str, List[str], bool]:
+    """One check: which of work_ids (<= WORKS_PER_ID_FILTER) list author_id among their authors, server-side."""
+    params = {
+        "filter": f"authorships.author.id:{author_id},ids.openalex:" + "|".join(work_ids),
+        "per_page": PER_PAGE,
+        "select": "id",
+        "mailto": MAILTO,
+    }
+    results, _, _, success = fetch_works_cursor_page(session, url, params)
+    return author_id, [work["id"] for work in results], success
+
+
+def fetch_authors_batched(
+    session,
+    authors: List[Tuple[int, str, str]],
+    start_year: int,
+    end_year: int,
+    doc_types: List[str],
+    selected_metadata: List[str],
+    language_filter: str,
+    page_callback=None,
+    request_callback=None,
+    formatted: Optional[Dict[str, Dict]] = None,
+) -> Dict[int, List[Dict]]:
+    """
+    Fetch several authors' works through one OR filter, authors = [(slot, author_id, "Name, Surname")],
+    then route every work back to the authors of the batch it contains (one row per author).
+    Returns {slot: rows}. Callbacks are called from worker threads (pass thread-safe ones).
+    """
+    url = "https://api.openalex.org/works"
+
+    by_id: Dict[str, List[Tuple[int, str]]] = {}
+    for slot, author_id, name in authors:
+        by_id.setdefault(bare_id(author_id), []).append((slot, name))
+
+    extra_filter_parts = ["language:en"] if language_filter == "english_only" else []
+    entity_filter = "authorships.author.id:" + "|".join(by_id)
+    streams = [
+        (",".join([entity_filter, year_filter] + extra_filter_parts), doc_type)
+        for year_filter in _year_filters(start_year, end_year, slice_years=False)
+        for doc_type in (doc_types or [None])  # None = all-works mode
+    ]
+
+    truncated: Dict[str, Dict] = {}
+    routed = fetch_cursor_streams(
+        session,
+        url,
+        streams,
+        lambda works: process_publications_for_authors(works, by_id, selected_metadata, formatted, truncated),
+        page_callback,
+        request_callback,
+        SeenWorkIds(),
+        select=",".join(_top_level_fields_needed(selected_metadata, "author")),
+    )
+
+    per_author: Dict[int, List[Dict]] = {slot: [] for slot, _, _ in authors}
+    for slot, row in routed:
+        per_author[slot].append(row)
+
+    # An author listed past the 100 authorships OpenAlex returns is invisible to the routing: ask the
+    # server which of those works are theirs, and stamp them as the single-author path does ("Not found").
+    # Every (author, id chunk) check is a single request, so they all go out at once on the shared EXECUTOR
+    checks = []
+    for author_id in by_id:
+        missing = [
+            work_id for work_id, pub in truncated.items()
+            if author_id not in build_author_index(pub.get("authorships"))
+        ]
+        for start in range(0, len(missing), WORKS_PER_ID_FILTER):
+            chunk = missing[start:start + WORKS_PER_ID_FILTER]
+            checks.append(EXECUTOR.submit(_authored_chunk, session, url, author_id, chunk))
+
+    authored: Dict[str, set] = {}
+    for check in checks:
+        author_id, work_ids, success = check.result()
+        if request_callback:
+            request_callback(bool(success))
+        authored.setdefault(author_id, set()).update(work_ids)
+
+    for author_id, work_ids in authored.items():
+        # streams fill `truncated` concurrently: sort, so the extra rows come in the same order every run
+        works = [truncated[work_id] for work_id in sorted(work_ids)]
+        for slot, name in by_id[author_id]:
+            per_author[slot].extend(
+                process_publications_batch(works, author_id, name, "author", selected_metadata, formatted)
+            )
+    return per_author
+
+
+def fetch_entities_parallel(
+    session,
+    entities: List[Tuple[str, str, str]],
+    start_year: int,
+    end_year: int,
+    doc_types: List[str],
+    selected_metadata: List[str],
+    language_filter: str,
+    page_callback=None,
+    request_callback=None,
+    entity_callback=None,
+) -> List[Dict]:
+    """
+    Fetch publications for several entities at once; entities are (entity_id, entity_name, entity_type).
+    Up to PARALLEL_ENTITIES entities run concurrently, all paced by the global rate limiter;
+    several authors are fetched AUTHORS_PER_FILTER at a time through OR filters (fetch_authors_batched).
+    Callbacks run on the caller's thread; entity_callback(index, publications) fires as each entity completes.
+    Returns every entity's publications (not yet deduplicated across entities), in input order.
+    """
+    if not entities:
+        return []
+
+    events: "queue.Queue" = queue.Queue()
+    relay_page, relay_request = _relay_callbacks(events, page_callback, request_callback)
+    per_entity: List[List[Dict]] = [[] for _ in entities]
+    # Rows formatted so far, by work id: a work found by several entities is formatted once
+    formatted: Dict[str, Dict] = {}
+
+    # Several authors: OR-batched, AUTHORS_PER_FILTER per request stream; institutions stay one by one
+    author_slots = [i for i, (_, _, entity_type) in enumerate(entities) if entity_type != "institution"]
+    if len(author_slots) < 2:
+        author_slots = []
+    author_batches = [author_slots[k:k + AUTHORS_PER_FILTER] for k in range(0, len(author_slots), AUTHORS_PER_FILTER)]
+    single_slots = sorted(set(range(len(entities))) - set(author_slots))
+
+    with ThreadPoolExecutor(max_workers=min(PARALLEL_ENTITIES, len(single_slots) + len(author_batches))) as executor:
+        # future ({slot: rows}) -> entity slots it covers
+        futures: Dict[Any, List[int]] = {}
+        for batch in author_batches:
+            future = executor.submit(
+                fetch_authors_batched,
+                session,
+                [(i, entities[i][0], entities[i][1]) for i in batch],
+                start_year,
+                end_year,
+                doc_types,
+                selected_metadata,
+                language_filter,
+                page_callback=relay_page,
+                request_callback=relay_request,
+                formatted=formatted,
+            )
+            futures[future] = batch
+
+        def fetch_one(i: int) -> Dict[int, List[Dict]]:
+            entity_id, entity_name, entity_type = entities[i]
+            return {i: fetch_publications_parallel(
+                session,
+                entity_id,
+                entity_name,
+                entity_type,
+                start_year,
+                end_year,
+                doc_types,
+                selected_metadata,
+                language_filter,
+                page_callback=relay_page,
+                request_callback=relay_request,
+                formatted=formatted,
+            )}
+
+        for i in single_slots:
+            futures[executor.submit(fetch_one, i)] = [i]
+
+        def on_done(f):
+            # failed HTTP calls never raise (they end their stream and reach request_callback);
+            # anything raised here is a bug and must not turn into a silently short export
+            result = f.result()
+            for i in futures[f]:
+                per_entity[i] = result.get(i, [])
+                if entity_callback:
+                    entity_callback(i, per_entity[i])
+
+        _wait_relaying(list(futures), events, page_callback, request_callback, done_callback=on_done)
+
+    return [pub for pubs in per_entity for pub in pubs]
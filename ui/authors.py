@@ -14,18 +14,32 @@
 """
 
 from typing import Optional, List, Dict, Tuple
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import numpy as np
+import openpyxl
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-from core.api_client import (
-    get_session,
-    search_author_by_name,    # name-only search
-)
+try:  # optional fast .xlsx parser; without it uploads are streamed with openpyxl
+    from python_calamine import CalamineError
+    CALAMINE_FALLBACK_ERRORS = (ImportError, CalamineError)
+except ImportError:
+    CALAMINE_FALLBACK_ERRORS = (ImportError,)
+
+from core.api_client import MAX_AUTHOR_WORKERS, search_author_by_name  # name-only search
+from core.formatters import OPENALEX_PREFIX, ORCID_PREFIX
+from ui.common import get_http_session
 
 # ---------- Config for parallel fetch ----------
-WORKERS = 10  # tune 8–12 safely; global rate limiter still keeps requests polite
+WORKERS = MAX_AUTHOR_WORKERS  # the shared session keeps one connection per worker; the global rate limiter keeps requests polite
+MAX_UPLOAD_ROWS = 100_000  # data rows read from an upload; longer files are rejected
+PROGRESS_INTERVAL = 0.1  # seconds between progress widget updates
+PAGE_SIZE = 25  # author expanders (each with its data editor) rendered per rerun
+SHEET_INDEX = 0  # every upload reader parses this worksheet (the first), whichever sheet was left active
 
 
 # ---------- Small helpers ----------
@@ -40,10 +54,100 @@ def auto_detect_column(columns: List[str], possible_names: List[str]) -> Optiona
             return lower[p.lower()]
     return None
 
-def _zwsp_salt(key: str) -> str:
-    """Invisible suffix so expander labels are unique without visible clutter."""
-    count = (abs(hash(key)) % 3) + 1
-    return "\u200b" * count  # zero-width space(s)
+def _cell_text(value) -> str:
+    return "" if value is None else str(value).strip()
+
+def read_header(uploaded_file) -> List[str]:
+    """
+    Column names from the first row of worksheet SHEET_INDEX (read-only stream, data rows never parsed).
+    Repeated names are suffixed like pandas does ('Name', 'Name.1', ...), so every column can be picked by name.
+    """
+    uploaded_file.seek(0)
+    wb = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        first = next(wb.worksheets[SHEET_INDEX].iter_rows(max_row=1, values_only=True), ())
+    finally:
+        wb.close()
+    header = list(first)
+    while header and header[-1] is None:  # trailing empty cells are not columns
+        header.pop()
+    columns: List[str] = []
+    taken = set()
+    for i, v in enumerate(header):
+        name = str(v) if v is not None else f"Unnamed: {i}"
+        column, k = name, 0
+        while column in taken:
+            k += 1
+            column = f"{name}.{k}"
+        taken.add(column)
+        columns.append(column)
+    return columns
+
+def _read_name_pairs_calamine(uploaded_file, surname_idx: int, name_idx: int, max_rows: int) -> List[Tuple[str, str]]:
+    """The two mapped columns through the Rust calamine parser (needs 'python-calamine'), up to max_rows rows."""
+    uploaded_file.seek(0)
+    df = pd.read_excel(
+        uploaded_file,
+        engine="calamine",
+        sheet_name=SHEET_INDEX,
+        header=None,
+        skiprows=1,  # header row, already read by read_header
+        nrows=max_rows,
+        usecols=sorted({surname_idx, name_idx}),
+        dtype="string",  # cells arrive as text: no numeric/date inference, no object columns
+    )
+    # One vectorized clean per column (empty cell -> "", like _cell_text), then plain tuples
+    def clean(column: pd.Series) -> List[str]:
+        return column.str.strip().fillna("").tolist()
+    return list(zip(clean(df[surname_idx]), clean(df[name_idx])))
+
+def _read_name_pairs_openpyxl(uploaded_file, surname_idx: int, name_idx: int, max_rows: int) -> List[Tuple[str, str]]:
+    """The two mapped columns, streamed row by row from a read-only openpyxl workbook, up to max_rows rows."""
+    uploaded_file.seek(0)
+    wb = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        pairs = []
+        for row in wb.worksheets[SHEET_INDEX].iter_rows(min_row=2, max_row=max_rows + 1, values_only=True):
+            surname = row[surname_idx] if surname_idx < len(row) else None
+            name = row[name_idx] if name_idx < len(row) else None
+            pairs.append((_cell_text(surname), _cell_text(name)))
+    finally:
+        wb.close()
+    return pairs
+
+def read_name_pairs(
+    uploaded_file, surname_idx: int, name_idx: int, max_rows: int = MAX_UPLOAD_ROWS
+) -> List[Tuple[str, str]]:
+    """
+    The two mapped columns only: [(surname, name)], stripped, one per data row.
+    Parsed with calamine when installed; without it (or on a workbook calamine rejects),
+    streamed with openpyxl read-only. Any other error is raised, not hidden behind the slow path.
+    Both stop one row past max_rows, so an oversized sheet raises ValueError without being read to the end.
+    """
+    try:
+        pairs = _read_name_pairs_calamine(uploaded_file, surname_idx, name_idx, max_rows + 1)
+    except CALAMINE_FALLBACK_ERRORS:
+        pairs = _read_name_pairs_openpyxl(uploaded_file, surname_idx, name_idx, max_rows + 1)
+    if len(pairs) > max_rows:
+        raise ValueError(f"the sheet has more than {max_rows:,} rows; please split it into smaller files.")
+    return pairs
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _upload_columns(file_id: str, _uploaded_file) -> Tuple[List[str], Optional[str], Optional[str]]:
+    """Header and auto-detected (surname, name) columns, once per upload (file_id) rather than every rerun."""
+    columns = read_header(_uploaded_file)
+    return (
+        columns,
+        auto_detect_column(columns, ["surname", "last_name", "family_name"]),
+        auto_detect_column(columns, ["name", "first_name", "given_name", "firstname"]),
+    )
+
+def _label_salt(i: int) -> str:
+    """
+    Invisible suffix so expander labels are unique without visible clutter (stored once per payload):
+    position i in author_order written in binary with zero-width space (0) / non-joiner (1).
+    """
+    return "".join("\u200b" if bit == "0" else "\u200c" for bit in format(i, "b"))
 
 
 # ---------- Candidate extraction from /authors results ----------
@@ -56,9 +160,9 @@ def _fmt_inst(display_name: str, cc: str) -> str:
 def _candidate_from_authors_result(match: Dict) -> Dict:
     """Build a candidate row from an /authors search result (no /people details call)."""
     # Basic fields
-    openalex_id = (match.get("id", "") or "").replace("https://openalex.org/", "")
+    openalex_id = (match.get("id", "") or "").removeprefix(OPENALEX_PREFIX)
     display_name = match.get("display_name", "") or ""
-    orcid = (match.get("orcid", "") or "").replace("https://orcid.org/", "")
+    orcid = (match.get("orcid", "") or "").removeprefix(ORCID_PREFIX)
     works_count = match.get("works_count", 0) or 0
 
     # 1) Affiliations 2025: from 'affiliations' list where 2025 in 'years'
@@ -94,106 +198,163 @@ def _candidate_from_authors_result(match: Dict) -> Dict:
         "affiliations_2025": aff_2025_list,      # NEW
         "last_known_insts": lki_list,            # NEW
         "topics": topics,
+        # editor cells, joined once here rather than on every frame build
+        "affiliations_2025_str": " | ".join(aff_2025_list[:4]),
+        "last_known_insts_str": " | ".join(lki_list[:4]),
+        "topics_str": " | ".join(topics[:3]),
     }
 
 
 # ---------- Editor frame builder ----------
 
+# Text cells are Arrow-backed, so data_editor's Arrow serialization needs no per-cell conversion
+TEXT_DTYPE = "string[pyarrow]"
+EDITOR_DTYPES = {
+    "Select": bool, "Name": TEXT_DTYPE, "ORCID": TEXT_DTYPE, "Publications": np.int64,
+    "Affiliations 2025": TEXT_DTYPE, "Last known institutions": TEXT_DTYPE, "Topics": TEXT_DTYPE,
+}
+
 def _build_editor_frame(cands: List[Dict], checked_ids: set) -> pd.DataFrame:
-    """Create a persistent editor DataFrame with stable row identity (index=ID)."""
-    # Ensure we always have the columns so set_index('ID') never fails
-    base_cols = [
-        "ID", "Select", "Name", "ORCID", "Publications",
-        "Affiliations 2025", "Last known institutions", "Topics"
-    ]
-    rows = []
-    for c in cands or []:
-        cid = c.get("id", "")
-        rows.append({
-            "ID": cid,
-            "Select": cid in checked_ids,
-            "Name": c.get("display_name", ""),
-            "ORCID": c.get("orcid", ""),
-            "Publications": c.get("works_count", 0),
-            "Affiliations 2025": " | ".join(c.get("affiliations_2025", [])[:4]),
-            "Last known institutions": " | ".join(c.get("last_known_insts", [])[:4]),
-            "Topics": " | ".join(c.get("topics", [])[:3]),
-        })
-
-    df = pd.DataFrame(rows, columns=base_cols)
-    # Even if empty, this works because the "ID" column exists
-    df = df.set_index("ID")
-    if "Select" in df.columns:
-        df["Select"] = df["Select"].astype(bool)
+    """Create a persistent editor DataFrame with stable row identity (index=ID), built column by column."""
+    if not cands:
+        # typed empty columns (empty lists would come out as float64)
+        return pd.DataFrame(
+            {col: pd.Series(dtype=dtype) for col, dtype in EDITOR_DTYPES.items()},
+            index=pd.Index([], dtype=TEXT_DTYPE, name="ID"),
+        )
+    ids = [c.get("id", "") for c in cands]
+    n = len(ids)
+    # Columns come out in their final dtypes (bool/int64), so no astype pass afterwards
+    data = {
+        "Select": np.fromiter((cid in checked_ids for cid in ids), dtype=bool, count=n),
+        "Name": pd.array([c.get("display_name", "") for c in cands], dtype=TEXT_DTYPE),
+        "ORCID": pd.array([c.get("orcid", "") for c in cands], dtype=TEXT_DTYPE),
+        "Publications": np.fromiter((c.get("works_count", 0) for c in cands), dtype=np.int64, count=n),
+        "Affiliations 2025": pd.array([c.get("affiliations_2025_str", "") for c in cands], dtype=TEXT_DTYPE),
+        "Last known institutions": pd.array([c.get("last_known_insts_str", "") for c in cands], dtype=TEXT_DTYPE),
+        "Topics": pd.array([c.get("topics_str", "") for c in cands], dtype=TEXT_DTYPE),
+    }
+    return pd.DataFrame(data, index=pd.Index(ids, dtype=TEXT_DTYPE, name="ID"), copy=False)
+
+
+def _editor_frame(key: str, data: Dict) -> pd.DataFrame:
+    """The author's persisted editor frame, built the first time it is needed."""
+    frames = st.session_state.editor_frames
+    df = frames.get(key)
+    if df is None:
+        df = frames[key] = _build_editor_frame(data["candidates"], checked_ids=set())
     return df
 
 
 # ---------- Parallel candidate discovery ----------
 
-def _make_session_pool(n: int) -> List:
-    """Create n independent sessions (requests.Session is not strictly thread-safe)."""
-    return [get_session() for _ in range(n)]
+def _normalize_name_part(text: str) -> str:
+    """Cache-key form of a name part: lower-case, whitespace collapsed (OpenAlex search ignores both)."""
+    return " ".join(text.lower().split())
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _search_author_cached(_session, first: str, last: str) -> List[Dict]:
+    """
+    Cached /authors search; reruns and repeated names skip the HTTP round-trip (session is not hashed).
+    A failed request raises (strict), and cache_data does not store exceptions, so the next run retries it.
+    """
+    return search_author_by_name(_session, first, last, strict=True)
+
+def _search_author(session, first: str, last: str) -> List[Dict]:
+    """/authors search keyed on normalized names, so 'Smith', 'smith ' and ' SMITH' share one cache entry."""
+    return _search_author_cached(session, _normalize_name_part(first), _normalize_name_part(last))
+
+@st.cache_resource
+def _candidate_executor() -> ThreadPoolExecutor:
+    """WORKERS threads for the candidate searches, started once and reused by every upload."""
+    return ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="author-search")
 
 def _fetch_candidates_for_one(session, first: str, last: str) -> Dict:
-    """Name search only. Return a payload with up to 20 candidates built from /authors results."""
+    """
+    Name search only. Return a payload with up to 20 candidates built from /authors results.
+    A failed search yields no candidates and search_failed=True (display_author_candidates warns about it).
+    """
     candidates: List[Dict] = []
+    failed = False
     try:
-        matches = search_author_by_name(session, first, last) or []
-        # keep top 20
-        matches = matches[:20]
+        matches = _search_author(session, first, last) or []  # top 20, capped server-side
         for m in matches:
             candidates.append(_candidate_from_authors_result(m))
     except Exception:
-        # swallow this person; the UI will show "No matches found."
-        pass
+        # this person gets "No matches found."; the failure is not cached, so reloading retries it
+        candidates = []
+        failed = True
 
     # Best-first by works_count
     candidates.sort(key=lambda c: c.get("works_count", 0), reverse=True)
-    return {"candidates": candidates}
+    # id -> candidate, built once here so committing a selection is a plain lookup (read-only)
+    return {"candidates": candidates, "cands_by_id": {c["id"]: c for c in candidates}, "search_failed": failed}
 
-def prefetch_author_candidates_parallel(df: pd.DataFrame, surname_col: str, name_col: str):
-    """Fetch candidates for all authors in parallel."""
+def prefetch_author_candidates_parallel(name_pairs: List[Tuple[str, str]]):
+    """Fetch candidates for all authors, name_pairs = [(surname, name)], in parallel."""
     st.session_state.author_candidates = {}
     st.session_state.editor_frames = {}
     st.session_state.prefilled = False
 
-    total = len(df)
+    # One search per person: repeated rows and case/spacing variants are grouped first,
+    # then the result is fanned out to every distinct input key of the group
+    groups: Dict[Tuple[str, str], Dict[str, Tuple[str, str]]] = {}
+    for surname, name in name_pairs:
+        if surname and name:
+            person = (_normalize_name_part(surname), _normalize_name_part(name))
+            groups.setdefault(person, {}).setdefault(_author_input_key(surname, name), (surname, name))
+
+    total = len(groups)
     progress = st.progress(0)
     status = st.empty()
 
-    sessions = _make_session_pool(WORKERS)
-
-    def job(idx: int, row: pd.Series) -> Tuple[int, Optional[Dict]]:
-        surname = str(row[surname_col]).strip() if pd.notna(row[surname_col]) else ""
-        name = str(row[name_col]).strip() if pd.notna(row[name_col]) else ""
-        if not surname or not name:
-            return idx, None
-        s = sessions[idx % WORKERS]
-        payload = _fetch_candidates_for_one(s, name, surname)  # first=name, last=surname
-        payload.update({
-            "input_name": f"{surname}, {name}",            # original file format if ever needed
-            "input_name_file_order": f"{name}, {surname}", # for UI headers
-            "surname": surname,
-            "name": name,
-            "selected": []
-        })
-        return idx, payload
-
-    futures = []
-    with ThreadPoolExecutor(max_workers=WORKERS) as ex:
-        for i, row in df.reset_index(drop=True).iterrows():
-            futures.append(ex.submit(job, i, row))
-
-        done = 0
-        for fut in as_completed(futures):
-            idx, payload = fut.result()
-            done += 1
+    # The app-wide pooled session (sized for every worker): connections stay warm across uploads
+    session = get_http_session()
+
+    # The pool threads outlive any one run: each job attaches this run's ScriptRunContext to its thread,
+    # so the st.cache_data lookup inside runs with a context like on the script thread
+    ctx = get_script_run_ctx()
+
+    def job(surname: str, name: str) -> Dict:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return _fetch_candidates_for_one(session, name, surname)  # first=name, last=surname
+
+    ex = _candidate_executor()
+    futures = {
+        ex.submit(job, *next(iter(variants.values()))): variants
+        for variants in groups.values()
+    }
+
+    done = 0
+    last_update = 0.0
+    for fut in as_completed(futures):
+        found = fut.result()
+        done += 1
+        # each widget write is a message to the browser: at most PROGRESS_INTERVAL apart, plus the last one
+        now = time.monotonic()
+        if now - last_update >= PROGRESS_INTERVAL or done == total:
             status.text(f"Fetching candidates… {done}/{total}")
             progress.progress(done / max(total, 1))
-            if payload:
-                key = _author_input_key(payload["surname"], payload["name"])
-                st.session_state.author_candidates[key] = payload
-                st.session_state.editor_frames[key] = _build_editor_frame(payload["candidates"], checked_ids=set())
+            last_update = now
+        for key, (surname, name) in futures[fut].items():
+            payload = {
+                **found,
+                "input_name": f"{surname}, {name}",            # original file format if ever needed
+                "input_name_file_order": f"{name}, {surname}", # for UI headers
+                "surname": surname,
+                "name": name,
+                "selected": []
+            }
+            st.session_state.author_candidates[key] = payload  # editor frame: built on first render
+
+    # Display order (A→Z by name, then surname; the input key breaks ties, so searches finishing in
+    # another order give the same list), sorted once here instead of on every rerun
+    candidates = st.session_state.author_candidates
+    st.session_state.author_order = sorted(
+        candidates, key=lambda k: (candidates[k]["name"].lower(), candidates[k]["surname"].lower(), k)
+    )
+    for i, key in enumerate(st.session_state.author_order):
+        candidates[key]["_label_salt"] = _label_salt(i)
 
     status.success(f"✅ Found candidates for {len(st.session_state.author_candidates)} authors")
     progress.empty()
@@ -208,6 +369,7 @@ def render_author_selector():
     # Init UI state (if not already)
     st.session_state.setdefault("author_candidates", {})
     st.session_state.setdefault("editor_frames", {})
+    st.session_state.setdefault("author_order", [])
     st.session_state.setdefault("prefilled", False)
 
     uploaded_file = st.file_uploader(
@@ -222,28 +384,34 @@ def render_author_selector():
             st.error("The file is larger than 10 MB. Please upload a smaller file.")
             return
 
+        # Only the header row is read here (once per upload); the two mapped columns are read on "Load candidates"
         try:
-            df = pd.read_excel(uploaded_file)
+            columns, surname_guess, name_guess = _upload_columns(uploaded_file.file_id, uploaded_file)
         except Exception as e:
             st.error(f"Error reading file: {e}")
             return
+        if not columns:
+            st.error("Error reading file: the first row (column names) is empty.")
+            return
 
         # Column mapping (no ORCID)
         st.subheader("Column Mapping")
-        columns = list(df.columns)
 
         col1, col2 = st.columns(2)
         with col1:
-            g = auto_detect_column(columns, ["surname", "last_name", "family_name"])
             surname_col = st.selectbox("Surname column", options=columns,
-                                       index=columns.index(g) if g else 0)
+                                       index=columns.index(surname_guess) if surname_guess else 0)
         with col2:
-            g = auto_detect_column(columns, ["name", "first_name", "given_name", "firstname"])
             name_col = st.selectbox("Name column", options=columns,
-                                    index=columns.index(g) if g else 0)
+                                    index=columns.index(name_guess) if name_guess else 0)
 
         if st.button("🔍 Load candidates", type="primary"):
-            prefetch_author_candidates_parallel(df, surname_col, name_col)
+            try:
+                name_pairs = read_name_pairs(uploaded_file, columns.index(surname_col), columns.index(name_col))
+            except Exception as e:
+                st.error(f"Error reading file: {e}")
+                return
+            prefetch_author_candidates_parallel(name_pairs)
 
         if st.session_state.get("author_candidates"):
             display_author_candidates()
@@ -260,6 +428,13 @@ def display_author_candidates():
     ]
     st.info(f"🧾 Names to review: **{total_names}**  •  No match: **{len(unmatched)}**")
 
+    failed = sum(1 for data in st.session_state.author_candidates.values() if data.get("search_failed"))
+    if failed:
+        st.warning(
+            f"⚠️ The OpenAlex search failed for {failed} name(s) (rate limit or network error); "
+            "they are listed as no match. Click 'Load candidates' again to retry them."
+        )
+
     if unmatched:
         with st.expander(f"Show authors with no matches ({len(unmatched)})", expanded=False):
             # bullet list for readability
@@ -272,24 +447,44 @@ def display_author_candidates():
         st.success("Prefilled best matches. You can adjust before confirming.")
         st.rerun()
 
+    # Authors A→Z by name, then surname (order computed once per upload); long lists are
+    # filtered/paged so only PAGE_SIZE editors are built per rerun
+    candidates = st.session_state.author_candidates
+    visible_keys = st.session_state.author_order
+    if len(visible_keys) > PAGE_SIZE:
+        c1, c2 = st.columns([3, 1])
+        with c1:
+            query = st.text_input("Filter by name", key="author_filter").strip().lower()
+        if query:
+            visible_keys = [k for k in visible_keys if query in candidates[k]["input_name_file_order"].lower()]
+        pages = max(1, -(-len(visible_keys) // PAGE_SIZE))
+        if st.session_state.get("author_page", 1) > pages:
+            st.session_state.author_page = pages  # the filter shrank the list
+        with c2:
+            page = st.number_input("Page", min_value=1, max_value=pages, step=1, key="author_page")
+        visible_keys = visible_keys[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        st.caption(
+            f"Showing {len(visible_keys)} of {total_names} authors. "
+            "Confirm before changing page or filter: unconfirmed ticks are not kept."
+        )
+
     # ---- BIG FORM: ticking inside does NOT rerun ----
     with st.form("authors_selection_form", clear_on_submit=False):
         # Capture editors' return values per author
         form_edits: Dict[str, pd.DataFrame] = {}
+        # Candidate frames are memoized in editor_frames; unmatched authors all share one empty frame
+        empty_frame = _build_editor_frame([], checked_ids=set())
 
-        # Sort authors A→Z by name, then surname
-        for key, data in sorted(
-            st.session_state.author_candidates.items(),
-            key=lambda kv: (kv[1]["name"].lower(), kv[1]["surname"].lower())
-        ):
-            label = f"📝 {data['input_name_file_order']}{_zwsp_salt(key)}"
+        for key in visible_keys:
+            data = candidates[key]
+            label = f"📝 {data['input_name_file_order']}{data['_label_salt']}"
             with st.expander(label, expanded=False):
                 cands = data["candidates"]
                 if not cands:
                     st.warning("No matches found.")
-                    df_display = _build_editor_frame([], checked_ids=set())
+                    df_display = empty_frame
                 else:
-                    df_display = st.session_state.editor_frames[key]
+                    df_display = _editor_frame(key, data)
 
                 edited_df = st.data_editor(
                     df_display,
@@ -344,12 +539,14 @@ def prefill_best_matches():
         cands = data["candidates"]
         if not cands:
             continue
-        best = max(cands, key=lambda x: x.get("works_count", 0))
+        best_id = max(cands, key=lambda x: x.get("works_count", 0)).get("id", "")
         df = st.session_state.editor_frames.get(key)
-        if df is None or df.empty or best.get("id", "") not in df.index:
+        if df is None:  # never rendered: build it already ticked
+            st.session_state.editor_frames[key] = _build_editor_frame(cands, checked_ids={best_id})
+            continue
+        if df.empty or best_id not in df.index:
             continue
-        df.loc[:, "Select"] = False
-        df.loc[best["id"], "Select"] = True
+        df["Select"] = df.index.to_numpy() == best_id
     st.session_state.prefilled = True
 
 def commit_all_selected_authors(form_edits: Dict[str, pd.DataFrame]):
@@ -357,40 +554,52 @@ def commit_all_selected_authors(form_edits: Dict[str, pd.DataFrame]):
     if "author_candidates" not in st.session_state:
         return
 
-    input_keys = set(st.session_state.author_candidates.keys())
-    st.session_state.setdefault("selected_entities", [])
+    input_keys = st.session_state.author_candidates.keys()  # set-like view: O(1) membership
 
-    # Remove any prior committed selections belonging to the current upload
-    st.session_state.selected_entities = [
-        e for e in st.session_state.selected_entities
+    # One pass: drop prior committed selections belonging to the current upload, then append the
+    # new ones to the same local list; session_state is written once at the end
+    entities = [
+        e for e in st.session_state.get("selected_entities", [])
         if not (e.get("type") == "author" and e.get("metadata", {}).get("input_key") in input_keys)
     ]
+    add_entity = entities.append
 
-    # Iterate over the edited DataFrames captured from the form
+    # Authors rendered in the form (the current page) take their edited DataFrames, which are
+    # written back to editor_frames; the others keep the ticks stored there (last confirm/prefill)
     for key, data in st.session_state.author_candidates.items():
+        frame = st.session_state.editor_frames.get(key)
         edited_df = form_edits.get(key)
-        if edited_df is None or "Select" not in edited_df.columns:
-            continue
-
-        # Ensure index=ID is preserved; if not, try to recover
-        if edited_df.index.name != "ID":
-            if "ID" in edited_df.columns:
-                edited_df = edited_df.set_index("ID")
-            else:
+        if edited_df is None:
+            if frame is None or frame.empty:
                 continue
+            selected_ids = list(frame.index[frame["Select"]])
+        else:
+            if "Select" not in edited_df.columns:
+                continue
+
+            # Ensure index=ID is preserved; if not, try to recover
+            if edited_df.index.name != "ID":
+                if "ID" in edited_df.columns:
+                    edited_df = edited_df.set_index("ID")
+                else:
+                    continue
 
-        selected_ids = list(edited_df.index[edited_df["Select"].astype(bool)])
+            selected_ids = list(edited_df.index[edited_df["Select"].astype(bool)])
+            if frame is not None and not frame.empty:
+                frame["Select"] = frame.index.isin(selected_ids)
 
         # Map to candidate dicts for metadata
-        cands_by_id = {c["id"]: c for c in data["candidates"]}
+        cands_by_id = data["cands_by_id"]
         for sid in selected_ids:
             cand = cands_by_id.get(sid)
             if not cand:
                 continue
-            st.session_state.selected_entities.append({
+            add_entity({
                 "type": "author",
                 "id": sid,
                 "label": f"{data['surname'].upper()} {data['name']} → {cand.get('display_name', '')}",
                 "file_label": f"{data['name']}, {data['surname']}",
                 "metadata": {**cand, "input_key": key, "file_surname": data["surname"], "file_name": data["name"]},
             })
+
+    st.session_state.selected_entities = entities
@@ -1,7 +1,6 @@
 """Shared UI components for configuration and retrieval"""
 import streamlit as st
 import pandas as pd
-import numpy as np
 import time
 import io
 import gc
@@ -10,9 +9,10 @@ from typing import List, Dict
 
 from core.api_client import get_session
 from core.processors import (
-    fetch_publications_parallel, deduplicate_publications_optimized,
-    clean_text_field
+    fetch_entities_parallel, PublicationAggregator,
+    output_columns
 )
+from core.formatters import clean_text_column
 
 # Constants
 CURRENT_YEAR = datetime.now().year
@@ -81,6 +81,11 @@ METADATA_FIELDS = {
     "datasets": "Related Datasets"
 }
 
+@st.cache_resource
+def get_http_session():
+    """One pooled session shared across reruns, so keep-alive connections stay warm."""
+    return get_session()
+
 def render_config_section():
     """Render the configuration section (Phase 2)"""
     st.header("2️⃣ Configure Retrieval Parameters")
@@ -240,6 +245,53 @@ def render_retrieval_section():
     
     if st.button("🚀 Start Retrieval", type="primary"):
         retrieve_publications()
+    else:
+        # Re-show the last result if nothing that shapes it has changed since
+        output = st.session_state.get("retrieval_output")
+        if output and output["signature"] == _retrieval_signature():
+            render_retrieval_output(output)
+
+def _retrieval_signature() -> tuple:
+    """Everything that determines the retrieval output (selection + configuration)."""
+    config = st.session_state.config
+    return (
+        st.session_state.selection_mode,
+        tuple(e['id'] for e in st.session_state.selected_entities),
+        config['start_year'],
+        config['end_year'],
+        config['language_filter'],
+        config['output_format'],
+        tuple(config['doc_types']),
+        tuple(config['metadata']),
+    )
+
+def render_retrieval_output(output: Dict):
+    """Render the summary metrics and download button of a finished retrieval"""
+    with st.container():
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Time Elapsed", str(timedelta(seconds=int(output['total_time']))))
+        with col2:
+            st.metric("Publications retrieved", f"{output['num_publications']:,}")
+        with col3:
+            st.metric("API calls (success)", f"{output['success_calls']:,}")
+        with col4:
+            st.metric("API calls (failed)", f"{output['failed_calls']:,}")
+    
+    st.success(
+        f"✅ Retrieved {output['num_publications']} unique publications "
+        f"from {output['num_entities']} {output['entity_type']}"
+    )
+    if output['output_format'] != "CSV":
+        st.info(f"File size: {len(output['data']) / (1024 * 1024):.1f} MB")
+    
+    st.download_button(
+        label=f"📥 Download {output['filename']}",
+        data=output['data'],
+        file_name=output['filename'],
+        mime=output['mime'],
+        type="primary"
+    )
 
 def retrieve_publications():
     """Main retrieval function"""
@@ -253,8 +305,8 @@ def retrieve_publications():
         st.error("Start year cannot be after end year")
         return
     
-    # Initialize session
-    session = get_session()
+    # Shared pooled session
+    session = get_http_session()
     
     # Progress tracking
     start_time = time.time()
@@ -263,7 +315,8 @@ def retrieve_publications():
     metrics_placeholder = st.empty()
     timer_placeholder = st.empty()
     
-    all_publications = []
+    # Cross-entity merge, fed as each entity completes
+    aggregator = PublicationAggregator()
     
     # live counters
     total_pubs = 0
@@ -286,80 +339,80 @@ def retrieve_publications():
             failed_calls += 1
         calls_placeholder.info(f"🔌 API calls — ✓ {success_calls} · ✗ {failed_calls}")
     
-    # Process each entity
-    for i, entity in enumerate(entities):
-        # Update progress
-        progress = (i + 1) / len(entities)
-        progress_bar.progress(progress)
-        
-        elapsed = time.time() - start_time
-        timer_placeholder.info(f"⏱️ Time elapsed: {str(timedelta(seconds=int(elapsed)))}")
-        
-        status_placeholder.info(f"Fetching: {entity['label']}")
-        
-        # Fetch publications
-        lang_filter = "english_only" if config['language_filter'] == "English Only" else "all_languages"
-        
-        # use the input-file name "Surname, Name" for authors; keep label for institutions
-        name_for_output = (
-            entity['label'] if entity['type'] == 'institution'
-            else entity.get('file_label', entity['label'])
-        )
-
-        entity_pubs = fetch_publications_parallel(
-            session,
+    # Fetch all entities (several in parallel; callbacks still run on this thread)
+    lang_filter = "english_only" if config['language_filter'] == "English Only" else "all_languages"
+    
+    # use the input-file name "Name, Surname" for authors; keep label for institutions
+    entity_specs = [
+        (
             entity['id'],
-            name_for_output,           # <-- "Name, Surname" for authors
+            entity['label'] if entity['type'] == 'institution' else entity.get('file_label', entity['label']),
             entity['type'],
-            config['start_year'],
-            config['end_year'],
-            config['doc_types'],
-            config['metadata'],
-            lang_filter,
-            page_callback=on_page,           # <-- new
-            request_callback=on_request      # <-- new
         )
+        for entity in entities
+    ]
+    
+    status_placeholder.info(f"Fetching {len(entities)} {entity_label}…")
+    completed = 0
+    rows_fetched = 0
+    # Entities finish in any order; their rows reach the aggregator in input order (as a contiguous
+    # prefix, so finished leading entities are merged right away), keeping the export order stable
+    finished: Dict[int, List[Dict]] = {}
+    next_index = 0
+    
+    def on_entity_done(index: int, entity_pubs: List[Dict]):
+        nonlocal completed, rows_fetched, next_index
+        completed += 1
+        rows_fetched += len(entity_pubs)
+        finished[index] = entity_pubs
+        while next_index in finished:
+            aggregator.add(finished.pop(next_index))
+            next_index += 1
         
-        all_publications.extend(entity_pubs)
+        # Update progress
+        progress_bar.progress(completed / len(entities))
+        elapsed = time.time() - start_time
+        timer_placeholder.info(f"⏱️ Time elapsed: {str(timedelta(seconds=int(elapsed)))}")
+        status_placeholder.info(f"Done: {entities[index]['label']}")
         
         # Update metrics
         metrics_placeholder.metric(
             label="Progress",
-            value=f"{i+1}/{len(entities)} {entity_label}",
-            delta=f"{len(all_publications)} publications fetched (pre-dedup)"
+            value=f"{completed}/{len(entities)} {entity_label}",
+            delta=f"{rows_fetched} publications fetched (pre-dedup)"
         )
-                
-        # Memory management
-        if len(all_publications) > 10000 and i % 3 == 0:
-            gc.collect()
+    
+    fetch_entities_parallel(
+        session,
+        entity_specs,
+        config['start_year'],
+        config['end_year'],
+        config['doc_types'],
+        config['metadata'],
+        lang_filter,
+        page_callback=on_page,
+        request_callback=on_request,
+        entity_callback=on_entity_done,
+    )
     
     # Deduplication
-    if all_publications:
+    if len(aggregator):
         status_placeholder.info("Deduplicating publications...")
         
-        total_before_dedup = len(all_publications)
-        merged_publications = deduplicate_publications_optimized(all_publications)
+        merged_publications = aggregator.finalize()
         
-        del all_publications
+        del aggregator
         gc.collect()
         
-        duplicates_removed = total_before_dedup - len(merged_publications)
+        # Create output dataframe in one shot, already in final column order;
+        # the row dicts are released right away so they never coexist with the encoded file
+        df_output = pd.DataFrame(merged_publications, columns=output_columns(config['metadata']))
+        num_publications = len(merged_publications)
+        del merged_publications
         
-        # Create output dataframe
-        df_output = pd.DataFrame(merged_publications)
-        
-        # Clean text fields
+        # Clean text fields (vectorized scan, Python cleaner only on dirty cells)
         for col in df_output.columns:
-            if df_output[col].dtype == 'object':
-                df_output[col] = df_output[col].apply(lambda x: clean_text_field(x) if isinstance(x, str) else x)
-        
-        # Reorder and rename columns
-        columns_order = ["id"] + [col for col in config['metadata'] if col != "id"]
-        columns_order.extend(["institutions_extracted", "authors_extracted", "position_extracted"])
-        
-        # Only include columns that exist
-        columns_order = [col for col in columns_order if col in df_output.columns]
-        df_output = df_output[columns_order]
+            df_output[col] = clean_text_column(df_output[col])
         
         # Rename columns
         column_mapping = {field: METADATA_FIELDS.get(field, field) for field in df_output.columns}
@@ -378,58 +431,43 @@ def retrieve_publications():
         # Calculate total time
         total_time = time.time() - start_time
         timer_placeholder.success(f"✅ Total processing time: {str(timedelta(seconds=int(total_time)))}")
-
-        with st.container():
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Time Elapsed", str(timedelta(seconds=int(total_time))))
-            with col2:
-                st.metric("Publications retrieved", f"{len(merged_publications):,}")
-            with col3:
-                st.metric("API calls (success)", f"{success_calls:,}")
-            with col4:
-                st.metric("API calls (failed)", f"{failed_calls:,}")
         
         # Save output
         if config['output_format'] == "CSV":
             filename = f"pubs_{num_entities}_{entity_type}_{timestamp}.csv"
             
+            # Encoded straight into the buffer (no intermediate str copy of the whole file)
             csv_buffer = io.BytesIO()
-            csv_string = df_output.to_csv(index=False, lineterminator='\n')
-            csv_buffer.write(csv_string.encode('utf-8-sig'))
-            csv_data = csv_buffer.getvalue()
-            
-            st.success(f"✅ Retrieved {len(merged_publications)} unique publications from {num_entities} {entity_type}")
-            
-            st.download_button(
-                label=f"📥 Download {filename}",
-                data=csv_data,
-                file_name=filename,
-                mime="text/csv",
-                type="primary"
-            )
+            df_output.to_csv(csv_buffer, index=False, lineterminator='\n', encoding='utf-8-sig')
+            file_data = csv_buffer.getvalue()
+            mime = "text/csv"
         else:  # Parquet
             filename = f"pubs_{num_entities}_{entity_type}_{timestamp}.parquet"
             
             parquet_buffer = io.BytesIO()
             df_output.to_parquet(parquet_buffer, index=False, compression='snappy')
-            parquet_data = parquet_buffer.getvalue()
-            
-            file_size_mb = len(parquet_data) / (1024 * 1024)
-            
-            st.success(f"✅ Retrieved {len(merged_publications)} unique publications from {num_entities} {entity_type}")
-            st.info(f"File size: {file_size_mb:.1f} MB")
-            
-            st.download_button(
-                label=f"📥 Download {filename}",
-                data=parquet_data,
-                file_name=filename,
-                mime="application/octet-stream",
-                type="primary"
-            )
+            file_data = parquet_buffer.getvalue()
+            mime = "application/octet-stream"
+        
+        # Keep the finished file so reruns (e.g. the download click) reuse it instead of recomputing
+        st.session_state.retrieval_output = {
+            "signature": _retrieval_signature(),
+            "filename": filename,
+            "data": file_data,
+            "mime": mime,
+            "output_format": config['output_format'],
+            "num_publications": num_publications,
+            "num_entities": num_entities,
+            "entity_type": entity_type,
+            "total_time": total_time,
+            "success_calls": success_calls,
+            "failed_calls": failed_calls,
+        }
+        render_retrieval_output(st.session_state.retrieval_output)
         
         # Final cleanup
         del df_output
         gc.collect()
     else:
+        st.session_state.pop("retrieval_output", None)
         st.warning("No publications found for the selected criteria")
\ No newline at end of file
@@ -1,7 +1,6 @@
 # ui/institutions.py
 """Institution selection UI (no selection cap, with soft warnings)."""
 
-from typing import Optional
 import pandas as pd
 import streamlit as st
 
@@ -100,13 +99,19 @@ def render_institution_selector():
 
                     if not selected_rows.empty:
                         added_count = 0
-                        for idx, row in selected_rows.iterrows():
+                        # plain tuples, not a Series per row
+                        rows = zip(
+                            results_df.loc[selected_rows.index, "openalex_id"],
+                            selected_rows["Name"],
+                            selected_rows["Avg. Works/Year"],
+                        )
+                        for openalex_id, label, avg_works in rows:
                             entity = {
                                 "type": "institution",
-                                "id": results_df.loc[idx, "openalex_id"],
-                                "label": row["Name"],
+                                "id": openalex_id,
+                                "label": label,
                                 "metadata": {
-                                    "avg_works_per_year": row["Avg. Works/Year"],
+                                    "avg_works_per_year": avg_works,
                                 },
                             }
                             # no cap – just prevent duplicates
@@ -128,6 +133,14 @@ def render_institution_selector():
     display_selected_institutions()
 
 
+def _clear_institutions():
+    """Button callback: only remove institutions; keep other selections (e.g., authors) if any."""
+    st.session_state.selected_entities = [e for e in st.session_state.selected_entities if e["type"] != "institution"]
+
+def _remove_institution(entity_id: str):
+    """Button callback: drop one institution (runs before the rerun, so the list redraws once)."""
+    st.session_state.selected_entities = [e for e in st.session_state.selected_entities if e["id"] != entity_id]
+
 def display_selected_institutions():
     """Show selected institutions and soft warnings."""
     # Ensure the container exists
@@ -144,10 +157,7 @@ def display_selected_institutions():
     with col1:
         st.subheader(f"📋 {len(institution_entities)} Selected Institutions")
     with col3:
-        if st.button("🗑️ Clear All"):
-            # only remove institutions; keep other selections (e.g., authors) if any
-            st.session_state.selected_entities = [e for e in st.session_state.selected_entities if e["type"] != "institution"]
-            st.rerun()
+        st.button("🗑️ Clear All", on_click=_clear_institutions)
 
     # ---- Soft warnings ----
     # 1) Many institutions
@@ -189,6 +199,7 @@ def display_selected_institutions():
         with colL:
             st.write(f"**{i}.** {entity['label']}")
         with colR:
-            if st.button("❌", key=f"remove_inst_{entity['id']}", help=f"Remove {entity['label']}"):
-                st.session_state.selected_entities.remove(entity)
-                st.rerun()
+            st.button(
+                "❌", key=f"remove_inst_{entity['id']}", help=f"Remove {entity['label']}",
+                on_click=_remove_institution, args=(entity["id"],),
+            )
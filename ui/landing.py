@@ -2,6 +2,11 @@
 """Landing page for method selection with equal-sized cards and output note below."""
 import streamlit as st
 
+def _choose_mode(mode: str):
+    """Button callback: state is set before the rerun, so no explicit st.rerun() is needed."""
+    st.session_state.selection_mode = mode
+    st.session_state.selected_entities = []
+
 def show_landing_page():
     st.markdown("### Choose Your Retrieval Method")
     st.markdown("Select how you want to retrieve publications from OpenAlex:")
@@ -33,10 +38,10 @@ def show_landing_page():
             unsafe_allow_html=True,
         )
         st.markdown("")  # spacer
-        if st.button("Select Institutions", key="inst_btn", use_container_width=True, type="primary"):
-            st.session_state.selection_mode = "institutions"
-            st.session_state.selected_entities = []
-            st.rerun()
+        st.button(
+            "Select Institutions", key="inst_btn", use_container_width=True, type="primary",
+            on_click=_choose_mode, args=("institutions",),
+        )
 
     with col2:
         st.markdown(
@@ -57,10 +62,10 @@ def show_landing_page():
             unsafe_allow_html=True,
         )
         st.markdown("")  # spacer
-        if st.button("Select Authors", key="auth_btn", use_container_width=True, type="primary"):
-            st.session_state.selection_mode = "authors"
-            st.session_state.selected_entities = []
-            st.rerun()
+        st.button(
+            "Select Authors", key="auth_btn", use_container_width=True, type="primary",
+            on_click=_choose_mode, args=("authors",),
+        )
 
     # --- Output behavior banner (after the choice) ---
     st.markdown("")